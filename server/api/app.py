@@ -1,7 +1,9 @@
 """FastAPI application setup."""
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+import anyio.to_thread
 import asyncio
 import hashlib
 import logging
@@ -11,8 +13,10 @@ from api.routes import auth, agent, telegram
 from api.routes.health import router as health_router
 from config.logging_config import setup_logging
 from config.settings import settings
-from database.client import init_supabase
+from database.client import init_pool, close_pool
+from database.repositories.user_repo import reset_request_user_cache
 from core.dependencies import init_dependencies, shutdown_dependencies
+from services.oauth_service import close_http_client as close_oauth_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +29,29 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
     # STARTUP
+    # Blocking work (Google API calls, OCR, bcrypt) rides asyncio.to_thread,
+    # whose default executor caps at min(32, cpu_count + 4) threads and
+    # silently serializes IO-bound calls under load. Install a larger one,
+    # and raise anyio's limiter to match for FastAPI's sync-route offloads.
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=settings.THREAD_POOL_SIZE, thread_name_prefix="planly-io"
+        )
+    )
+    anyio.to_thread.current_default_thread_limiter().total_tokens = (
+        settings.THREAD_POOL_SIZE
+    )
+
     logger.info("Initializing database connection...")
-    init_supabase()
+    await init_pool()
     init_dependencies()
     logger.info("Application started")
     yield
     # SHUTDOWN
     await shutdown_dependencies()
+    await close_oauth_http_client()
+    await close_pool()
     logger.info("Application shut down")
 
 
@@ -80,6 +100,10 @@ def create_app() -> FastAPI:
     async def rate_limit_middleware(request: Request, call_next):
         nonlocal _last_eviction
 
+        # Fresh request-scoped user-lookup cache (see user_repo) — repeated
+        # lookups within this request become dict hits
+        reset_request_user_cache()
+
         # Determine rate-limit key: Bearer token hash for authenticated
         # requests, client IP for unauthenticated ones (webhooks, health, etc.)
         auth_header = request.headers.get("authorization", "")
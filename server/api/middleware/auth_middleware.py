@@ -7,8 +7,7 @@ import logging
 import time
 
 from utils.jwt_utils import decode_access_token
-from database.client import get_supabase
-from database.repositories.user_repo import UserRepository
+from core.dependencies import get_user_repo
 
 logger = logging.getLogger(__name__)
 
@@ -75,8 +74,7 @@ async def get_current_user(
     user = _get_cached_user(user_id)
     if user is None:
         # Cache miss — fetch from database
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         user = await user_repo.get_by_id(UUID(user_id))
 
         if not user:
@@ -1,5 +1,4 @@
 """Agent API routes — main endpoints for processing conversations."""
-from asyncio import to_thread
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, HTTPException, Depends, status, Header
 from fastapi.responses import JSONResponse
@@ -20,10 +19,9 @@ from api.schemas.response_schemas import (
     ErrorBlock,
 )
 from api.middleware.auth_middleware import get_current_user
-from database.client import get_supabase
-from database.repositories.conversation_repo import ConversationRepository
+from database.client import get_pool
 from models.action import ActionPlan, ToolCall
-from core.dependencies import get_agent, get_tool_registry
+from core.dependencies import get_agent, get_conversation_repo, get_tool_registry
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -41,22 +39,31 @@ async def _cache_action_plan(
 ) -> None:
     """Store action plan in the database so it survives multi-worker / restarts."""
     try:
-        supabase = get_supabase()
-        data = {
-            "conversation_id": conversation_id,
-            "intent_data": intent or {},
-            "tool_calls": tools,
-            "idempotency_key": idempotency_key,
-            "status": "pending",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "expires_at": (datetime.now(timezone.utc) + timedelta(minutes=15)).isoformat(),
-        }
+        pool = get_pool()
+        now = datetime.now(timezone.utc)
         # Upsert — if the same conversation already has a cached plan, overwrite it
-        await to_thread(
-            lambda: supabase.table("action_plan_cache")
-            .upsert(data, on_conflict="conversation_id")
-            .execute()
-        )
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO action_plan_cache
+                    (conversation_id, intent_data, tool_calls, idempotency_key,
+                     status, created_at, expires_at)
+                VALUES ($1, $2, $3, $4, 'pending', $5, $6)
+                ON CONFLICT (conversation_id) DO UPDATE SET
+                    intent_data = EXCLUDED.intent_data,
+                    tool_calls = EXCLUDED.tool_calls,
+                    idempotency_key = EXCLUDED.idempotency_key,
+                    status = 'pending',
+                    created_at = EXCLUDED.created_at,
+                    expires_at = EXCLUDED.expires_at
+                """,
+                conversation_id,
+                intent or {},
+                tools,
+                idempotency_key,
+                now,
+                now + timedelta(minutes=15),
+            )
     except Exception as e:
         logger.warning(f"Failed to cache action plan (table may not exist): {e}")
 
@@ -64,30 +71,25 @@ async def _cache_action_plan(
 async def _get_cached_plan(conversation_id: str) -> Optional[dict]:
     """Retrieve a cached action plan.  Returns None if missing, consumed, or expired."""
     try:
-        supabase = get_supabase()
-        resp = await to_thread(
-            lambda: supabase.table("action_plan_cache")
-            .select("*")
-            .eq("conversation_id", conversation_id)
-            .eq("status", "pending")
-            .execute()
-        )
-        if not resp.data:
-            return None
-
-        row = resp.data[0]
-        # TTL check — 15 minutes
-        created = datetime.fromisoformat(row["created_at"].replace("Z", "+00:00"))
-        if datetime.now(timezone.utc) - created > timedelta(minutes=15):
-            # Expired — clean up
-            await to_thread(
-                lambda: supabase.table("action_plan_cache")
-                .delete()
-                .eq("conversation_id", conversation_id)
-                .execute()
+        pool = get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT * FROM action_plan_cache "
+                "WHERE conversation_id = $1 AND status = 'pending'",
+                conversation_id,
             )
-            return None
-        return row
+            if row is None:
+                return None
+
+            # TTL check — 15 minutes
+            if datetime.now(timezone.utc) - row["created_at"] > timedelta(minutes=15):
+                # Expired — clean up
+                await conn.execute(
+                    "DELETE FROM action_plan_cache WHERE conversation_id = $1",
+                    conversation_id,
+                )
+                return None
+            return dict(row)
     except Exception as e:
         logger.warning(f"Failed to read cached plan (table may not exist): {e}")
         return None
@@ -95,13 +97,12 @@ async def _get_cached_plan(conversation_id: str) -> Optional[dict]:
 
 async def _delete_cached_plan(conversation_id: str) -> None:
     try:
-        supabase = get_supabase()
-        await to_thread(
-            lambda: supabase.table("action_plan_cache")
-            .delete()
-            .eq("conversation_id", conversation_id)
-            .execute()
-        )
+        pool = get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                "DELETE FROM action_plan_cache WHERE conversation_id = $1",
+                conversation_id,
+            )
     except Exception as e:
         logger.warning(f"Failed to delete cached plan: {e}")
 
@@ -115,23 +116,24 @@ async def _consume_cached_plan(conversation_id: str) -> Optional[dict]:
     Returns None if the plan is missing, expired, or already consumed.
     """
     try:
-        supabase = get_supabase()
-        resp = await to_thread(
-            lambda: supabase.table("action_plan_cache")
-            .update({"status": "consumed"})
-            .eq("conversation_id", conversation_id)
-            .eq("status", "pending")
-            .execute()
-        )
-        if not resp.data:
+        pool = get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                UPDATE action_plan_cache
+                SET status = 'consumed'
+                WHERE conversation_id = $1 AND status = 'pending'
+                RETURNING *
+                """,
+                conversation_id,
+            )
+        if row is None:
             return None
 
-        row = resp.data[0]
         # TTL check — 15 minutes
-        created = datetime.fromisoformat(row["created_at"].replace("Z", "+00:00"))
-        if datetime.now(timezone.utc) - created > timedelta(minutes=15):
+        if datetime.now(timezone.utc) - row["created_at"] > timedelta(minutes=15):
             return None  # Expired
-        return row
+        return dict(row)
     except Exception as e:
         logger.warning(f"Failed to consume cached plan: {e}")
         return None
@@ -204,8 +206,7 @@ async def process_conversation(
     """
     try:
         agent = get_agent()
-        supabase = get_supabase()
-        conversation_repo = ConversationRepository(supabase)
+        conversation_repo = get_conversation_repo()
 
         # Idempotency check
         idem_key = x_idempotency_key or _compute_idempotency_key(request)
@@ -397,8 +398,7 @@ async def confirm_actions(
 
         # Ownership check BEFORE consuming the plan — a failed authz check
         # must not destroy the cached plan for the legitimate owner.
-        supabase = get_supabase()
-        conversation_repo = ConversationRepository(supabase)
+        conversation_repo = get_conversation_repo()
         conversation = await conversation_repo.get_conversation_by_id(
             UUID(request.conversation_id)
         )
@@ -16,8 +16,7 @@ from api.schemas.request_schemas import (
 )
 from api.schemas.response_schemas import TokenResponse, UserResponse, UserProfileResponse
 from api.middleware.auth_middleware import get_current_user
-from database.client import get_supabase
-from database.repositories.user_repo import UserRepository
+from core.dependencies import get_user_repo
 from services.auth_service import AuthService
 
 logger = logging.getLogger(__name__)
@@ -28,8 +27,7 @@ router = APIRouter()
 async def register(request: RegisterRequest):
     """Register a new user"""
     try:
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         auth_service = AuthService(user_repo)
 
         user, access_token, refresh_token = await auth_service.register_user(
@@ -55,8 +53,7 @@ async def register(request: RegisterRequest):
 async def login(request: LoginRequest):
     """Login user"""
     try:
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         auth_service = AuthService(user_repo)
 
         user, access_token, refresh_token = await auth_service.login_user(
@@ -81,8 +78,7 @@ async def login(request: LoginRequest):
 async def refresh_token(request: RefreshTokenRequest):
     """Refresh access token"""
     try:
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         auth_service = AuthService(user_repo)
 
         new_access_token = await auth_service.refresh_access_token(request.refresh_token)
@@ -253,8 +249,7 @@ async def google_oauth_callback_get(
         user_info = auth_result["user_info"]
 
         # Find or create user
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         auth_service = AuthService(user_repo)
 
         user = await user_repo.get_by_email(user_info["email"])
@@ -319,8 +314,7 @@ async def google_oauth_callback(request: GoogleOAuthCallbackRequest):
         user_info = auth_result['user_info']
 
         # Find or create user
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         auth_service = AuthService(user_repo)
 
         user = await user_repo.get_by_email(user_info['email'])
@@ -380,8 +374,7 @@ async def generate_link_code(current_user: dict = Depends(get_current_user)):
     The code expires after 10 minutes and can only be used once.
     """
     try:
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         auth_service = AuthService(user_repo)
 
         code = await auth_service.generate_telegram_link_code(
@@ -415,8 +408,7 @@ async def link_telegram(request: LinkTelegramRequest):
     authenticated session.
     """
     try:
-        supabase = get_supabase()
-        user_repo = UserRepository(supabase)
+        user_repo = get_user_repo()
         auth_service = AuthService(user_repo)
 
         user = await auth_service.redeem_telegram_link_code(
@@ -1,6 +1,6 @@
 """Health check routes"""
 from fastapi import APIRouter, HTTPException
-from database.client import get_supabase
+from database.client import get_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,16 +17,17 @@ async def health_check():
 async def database_health():
     """Check database connectivity and schema"""
     try:
-        supabase = get_supabase()
+        pool = get_pool()
 
         # Verify core tables are reachable (details logged server-side only)
         tables_ok = True
-        for table in ("users", "conversations"):
-            try:
-                supabase.table(table).select("id").limit(1).execute()
-            except Exception as e:
-                tables_ok = False
-                logger.error(f"Table check failed for '{table}': {e}")
+        async with pool.acquire() as conn:
+            for table in ("users", "conversations"):
+                try:
+                    await conn.fetchval(f"SELECT id FROM {table} LIMIT 1")
+                except Exception as e:
+                    tables_ok = False
+                    logger.error(f"Table check failed for '{table}': {e}")
 
         return {
             "status": "ok" if tables_ok else "degraded",
@@ -6,10 +6,8 @@ import logging
 
 from api.schemas.request_schemas import TelegramWebhookRequest
 from api.schemas.response_schemas import TelegramWebhookResponse
-from database.client import get_supabase
-from database.repositories.conversation_repo import ConversationRepository
 from config.settings import settings
-from core.dependencies import get_agent
+from core.dependencies import get_agent, get_conversation_repo
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -55,8 +53,7 @@ async def telegram_webhook(
     _validate_telegram_secret(x_telegram_bot_api_secret_token)
 
     try:
-        supabase = get_supabase()
-        conversation_repo = ConversationRepository(supabase)
+        conversation_repo = get_conversation_repo()
 
         # Get or create conversation for this Telegram group
         conversation = await conversation_repo.get_or_create_conversation(
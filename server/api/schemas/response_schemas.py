@@ -30,6 +30,9 @@ class ProposedAction(BaseModel):
     tool_name: str
     description: str
     parameters: Dict[str, Any]
+    # Plan-time parameter validation failure, if any — lets the proposal
+    # UI disable the action instead of failing it after confirmation.
+    validation_error: Optional[str] = None
 
 
 # Block types for agent response (AGENT_1_TASKS spec)
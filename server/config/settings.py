@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
     SUPABASE_DB_URL: Optional[str] = None
+    # Transaction-mode pgbouncer endpoint (…pooler.supabase.com:6543).
+    # When set, repo queries go through it — many coroutines multiplex onto
+    # few Postgres backends. Prepared statements are disabled on this path.
+    SUPABASE_PGBOUNCER_URL: Optional[str] = None
 
     # LLM Configuration
     USE_CLOUD_LLM: bool = False
@@ -27,6 +31,8 @@ class Settings(BaseSettings):
     LLM_INTENT_TIMEOUT: int = 20
     LLM_PLANNING_TIMEOUT: int = 15
     LLM_RESPONSE_TIMEOUT: int = 15
+    # Cap on simultaneous outbound LLM requests per process
+    LLM_MAX_CONCURRENCY: int = 8
 
     # Google Calendar
     GOOGLE_CALENDAR_ID: Optional[str] = None
@@ -40,6 +46,9 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # bcrypt work factor. Tests override this down to 4 — each unit of
+    # cost doubles hashing time, so never go below 12 in deployment.
+    BCRYPT_COST: int = 12
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 
     # Google OAuth
@@ -51,6 +60,12 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     LOG_LEVEL: str = "INFO"
+    # Default executor size for asyncio.to_thread offloads (Google API
+    # calls, OCR, bcrypt) and FastAPI's sync-route thread pool
+    THREAD_POOL_SIZE: int = 64
+    # Uvicorn worker processes. Each worker gets its own event loop, DB
+    # pool, and in-process caches — size the Postgres pool accordingly.
+    WORKERS: int = 1
 
     # CORS — explicit list of allowed origins
     ALLOWED_ORIGINS: List[str] = [
@@ -2,6 +2,7 @@
 import asyncio
 import time
 import logging
+from operator import itemgetter
 from uuid import UUID
 from typing import Optional
 
@@ -12,6 +13,9 @@ from database.repositories.event_repo import EventRepository
 
 logger = logging.getLogger(__name__)
 
+# C-level accessor for aggregating tool results on the hot path
+_get_success = itemgetter('success')
+
 
 class AgentError(Exception):
     """Typed agent errors so callers can distinguish transient from permanent failures."""
@@ -20,6 +24,24 @@ class AgentError(Exception):
         self.retryable = retryable
 
 
+class _PhaseTimer:
+    """Accumulates per-phase durations so each ORPLAR run emits one log line."""
+
+    def __init__(self):
+        self._start_ns = time.perf_counter_ns()
+        self._t0 = self._start_ns
+        self.timings: dict[str, int] = {}
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter_ns()
+        self.timings[phase] = (now - self._t0) // 1_000_000
+        self._t0 = now
+
+    @property
+    def total_ms(self) -> int:
+        return (time.perf_counter_ns() - self._start_ns) // 1_000_000
+
+
 class PlanlyAgent:
     """
     Main agent orchestrator implementing:
@@ -37,6 +59,25 @@ class PlanlyAgent:
         self.reasoning_engine = reasoning_engine
         self.tool_registry = tool_registry
         self.event_repo = event_repo
+        # Strong references to in-flight background tasks so they are not
+        # garbage-collected mid-flight ("Task was destroyed but it is pending").
+        self._bg_tasks: set[asyncio.Task] = set()
+
+    def _log_action_background(self, **kwargs) -> None:
+        """Persist an audit log entry without blocking the response path.
+
+        Audit logging is best-effort and not on the correctness path, so we
+        fire-and-forget instead of adding a DB round-trip to the user-visible
+        latency of every request.
+        """
+        task = asyncio.create_task(self.event_repo.log_action(**kwargs))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_task_done)
+
+    def _on_bg_task_done(self, task: asyncio.Task) -> None:
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Background log_action failed: %s", task.exception())
 
     async def process_conversation(
         self,
@@ -60,12 +101,13 @@ class PlanlyAgent:
             'error_retryable': bool,          # only when status == 'error'
         }
         """
-        start_time = time.time()
+        timer = _PhaseTimer()
 
         try:
             # 1. OBSERVE: Get conversation context
-            logger.info(f"OBSERVE: Getting context for conversation {conversation_id}")
+            logger.debug("OBSERVE: Getting context for conversation %s", conversation_id)
             context = await self.context_manager.get_context(conversation_id)
+            timer.mark('observe')
 
             if not context.messages:
                 logger.warning("No messages in context")
@@ -78,12 +120,13 @@ class PlanlyAgent:
                 }
 
             # 2. REASON: Extract intent from conversation
-            logger.info("REASON: Extracting intent from conversation")
+            logger.debug("REASON: Extracting intent from conversation")
             intent = await self.reasoning_engine.extract_intent(context)
+            timer.mark('reason')
 
             # Check if clarification is needed
             if intent.clarification_needed:
-                logger.info(f"Clarification needed: {intent.clarification_needed}")
+                logger.info("Clarification needed: %s", intent.clarification_needed)
                 return {
                     'status': 'needs_clarification',
                     'intent': intent.dict(),
@@ -93,24 +136,21 @@ class PlanlyAgent:
                 }
 
             # 3. PLAN: Determine which tools to use
-            logger.info("PLAN: Creating action plan")
+            logger.debug("PLAN: Creating action plan")
             action_plan = await self.reasoning_engine.create_action_plan(intent)
+            timer.mark('plan')
 
-            # Log the planning phase
-            execution_time = int((time.time() - start_time) * 1000)
-            logger.info(f"Planning completed in {execution_time}ms")
+            # Single structured record for the whole O->R->P pass
+            logger.info(
+                "ORPLAR plan conv=%s total=%dms timings=%s",
+                conversation_id, timer.total_ms, timer.timings,
+            )
 
             return {
                 'status': 'ok',
                 'intent': intent.dict(),
                 'proposed_actions': [
-                    {
-                        'action_id': tool.action_id,
-                        'tool_name': tool.tool_name,
-                        'description': tool.description,
-                        'parameters': tool.parameters,
-                    }
-                    for tool in action_plan.tools
+                    tool.to_public_dict() for tool in action_plan.tools
                 ],
                 'requires_clarification': False,
                 'clarification_question': None,
@@ -120,7 +160,8 @@ class PlanlyAgent:
             retryable = _is_retryable(e)
             error_code = _classify_error(e)
             logger.error(
-                f"Error in process_conversation (code={error_code}, retryable={retryable}): {e}",
+                "Error in process_conversation (code=%s, retryable=%s): %s",
+                error_code, retryable, e,
                 exc_info=True,
             )
             return {
@@ -155,30 +196,33 @@ class PlanlyAgent:
             'formatted_response': str
         }
         """
-        start_time = time.time()
+        timer = _PhaseTimer()
 
         try:
             # Filter tools to only execute confirmed ones
+            wanted = frozenset(action_ids)
             tools_to_execute = [
                 tool for tool in action_plan.tools
-                if tool.action_id in action_ids
+                if tool.action_id in wanted
             ]
 
-            logger.info(f"ACT: Executing {len(tools_to_execute)} tools")
+            logger.debug("ACT: Executing %d tools", len(tools_to_execute))
 
             # 4. ACT: Execute tools (in parallel where safe)
             results = await self._execute_plan(tools_to_execute)
+            timer.mark('act')
 
             # 5. RESPOND: Format response
-            logger.info("RESPOND: Composing response")
+            logger.debug("RESPOND: Composing response")
             response = await self.reasoning_engine.compose_response(
                 intent=intent,
                 results=results,
             )
+            timer.mark('respond')
 
             # Log action
-            execution_time = int((time.time() - start_time) * 1000)
-            await self.event_repo.log_action(
+            execution_time = timer.total_ms
+            self._log_action_background(
                 conversation_id=conversation_id,
                 user_id=user_id,
                 trigger_source="desktop_keybind",
@@ -186,11 +230,14 @@ class PlanlyAgent:
                 intent_data=intent if intent else {},
                 tool_calls=[tool.dict() for tool in tools_to_execute],
                 response_text=response,
-                success=all(r['success'] for r in results),
+                success=all(map(_get_success, results)),
                 execution_time_ms=execution_time,
             )
 
-            logger.info(f"Execution completed in {execution_time}ms")
+            logger.info(
+                "ORPLAR act conv=%s total=%dms timings=%s",
+                conversation_id, execution_time, timer.timings,
+            )
 
             return {
                 'results': results,
@@ -198,7 +245,7 @@ class PlanlyAgent:
             }
 
         except Exception as e:
-            logger.error(f"Error executing actions: {e}", exc_info=True)
+            logger.error("Error executing actions: %s", e, exc_info=True)
             return {
                 'results': [],
                 'formatted_response': "I encountered an error while executing actions. Please try again.",
@@ -219,23 +266,26 @@ class PlanlyAgent:
 
         Returns: response text
         """
-        start_time = time.time()
+        timer = _PhaseTimer()
 
         try:
             # 1. OBSERVE
-            logger.info(f"OBSERVE: Getting context for conversation {conversation_id}")
+            logger.debug("OBSERVE: Getting context for conversation %s", conversation_id)
             context = await self.context_manager.get_context(conversation_id)
+            timer.mark('observe')
 
             # 2. REASON
-            logger.info("REASON: Extracting intent")
+            logger.debug("REASON: Extracting intent")
             intent = await self.reasoning_engine.extract_intent(context)
+            timer.mark('reason')
 
             if intent.clarification_needed:
                 return intent.clarification_needed
 
             # 3. PLAN
-            logger.info("PLAN: Creating action plan")
+            logger.debug("PLAN: Creating action plan")
             action_plan = await self.reasoning_engine.create_action_plan(intent)
+            timer.mark('plan')
 
             # Separate safe (read-only) tools from destructive ones
             safe_tools = []
@@ -250,13 +300,14 @@ class PlanlyAgent:
             # 4. ACT — only execute safe/read-only tools immediately
             results = []
             if safe_tools:
-                logger.info(f"ACT: Executing {len(safe_tools)} read-only tools")
+                logger.debug("ACT: Executing %d read-only tools", len(safe_tools))
                 results = await self._execute_plan(safe_tools)
+            timer.mark('act')
 
             if destructive_tools:
                 logger.info(
-                    f"HELD BACK {len(destructive_tools)} destructive tool(s) "
-                    "pending user confirmation"
+                    "HELD BACK %d destructive tool(s) pending user confirmation",
+                    len(destructive_tools),
                 )
                 held_names = [tc.tool_name for tc in destructive_tools]
                 results.append({
@@ -273,15 +324,16 @@ class PlanlyAgent:
                 })
 
             # 5. RESPOND
-            logger.info("RESPOND: Composing response")
+            logger.debug("RESPOND: Composing response")
             response = await self.reasoning_engine.compose_response(
                 intent=intent.dict(),
                 results=results,
             )
+            timer.mark('respond')
 
             # Log action
-            execution_time = int((time.time() - start_time) * 1000)
-            await self.event_repo.log_action(
+            execution_time = timer.total_ms
+            self._log_action_background(
                 conversation_id=conversation_id,
                 user_id=user_id,
                 trigger_source="telegram_mention",
@@ -289,54 +341,66 @@ class PlanlyAgent:
                 intent_data=intent.dict(),
                 tool_calls=[tool.dict() for tool in safe_tools],
                 response_text=response,
-                success=all(r.get('success') for r in results),
+                success=all(map(_get_success, results)),
                 execution_time_ms=execution_time,
             )
 
-            logger.info(f"ORPLAR loop completed in {execution_time}ms")
+            logger.info(
+                "ORPLAR loop conv=%s total=%dms timings=%s",
+                conversation_id, execution_time, timer.timings,
+            )
             return response
 
         except Exception as e:
-            logger.error(f"Error in process_mention: {e}", exc_info=True)
+            logger.error("Error in process_mention: %s", e, exc_info=True)
             return "I encountered an error processing your request. Please try again."
 
     # ------------------------------------------------------------------
     # Tool execution
     # ------------------------------------------------------------------
 
-    async def _execute_plan(self, tools: list) -> list[dict]:
-        """Execute tools with bounded concurrency and return results.
+    async def _execute_plan_stream(self, tools: list):
+        """Execute tools with bounded concurrency, yielding results as they complete.
 
-        Uses a semaphore to avoid overwhelming external APIs and
-        return_exceptions=True so that a failure in one tool does not
-        cancel or discard the results of the others.
+        Uses a semaphore to avoid overwhelming external APIs. Each tool is
+        error-isolated, so a failure in one tool does not cancel or discard
+        the results of the others. Results are yielded in COMPLETION order,
+        which lets callers surface the fastest tool's output immediately
+        instead of waiting for the slowest one.
         """
         if not tools:
-            return []
+            return
 
         semaphore = asyncio.Semaphore(5)
 
         async def _guarded(tc):
             async with semaphore:
-                return await self._execute_single_tool(tc)
+                try:
+                    return await self._execute_single_tool(tc)
+                except Exception as e:
+                    # _execute_single_tool handles its own errors; this is a
+                    # last-resort guard so the stream never raises mid-plan.
+                    logger.error("Tool %s raised unhandled exception: %s", tc.tool_name, e)
+                    return {
+                        'action_id': tc.action_id,
+                        'tool_name': tc.tool_name,
+                        'success': False,
+                        'error': "An internal error occurred while executing this tool.",
+                    }
 
-        tasks = [_guarded(tc) for tc in tools]
-        raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+        for future in asyncio.as_completed([_guarded(tc) for tc in tools]):
+            yield await future
 
-        results: list[dict] = []
-        for i, res in enumerate(raw_results):
-            if isinstance(res, Exception):
-                tc = tools[i]
-                logger.error(f"Tool {tc.tool_name} raised unhandled exception: {res}")
-                results.append({
-                    'action_id': tc.action_id,
-                    'tool_name': tc.tool_name,
-                    'success': False,
-                    'error': "An internal error occurred while executing this tool.",
-                })
-            else:
-                results.append(res)
-        return results
+    async def _execute_plan(self, tools: list) -> list[dict]:
+        """Execute tools and return all results in plan order.
+
+        Collects `_execute_plan_stream` into a list for callers that need
+        the complete result set before responding.
+        """
+        results_by_id: dict[str, dict] = {}
+        async for res in self._execute_plan_stream(tools):
+            results_by_id[res['action_id']] = res
+        return [results_by_id[tc.action_id] for tc in tools]
 
     async def _execute_single_tool(self, tool_call) -> dict:
         """Execute a single tool call with error isolation.
@@ -344,13 +408,13 @@ class PlanlyAgent:
         Does NOT mutate the tool_call object — returns a standalone result dict.
         Validates parameters before execution via the tool's schema.
         """
-        tool_start = time.time()
+        tool_start_ns = time.perf_counter_ns()
 
         try:
             tool = self.tool_registry.get_tool(tool_call.tool_name)
 
             if not tool:
-                logger.error(f"Tool not found: {tool_call.tool_name}")
+                logger.error("Tool not found: %s", tool_call.tool_name)
                 return {
                     'action_id': tool_call.action_id,
                     'tool_name': tool_call.tool_name,
@@ -358,14 +422,22 @@ class PlanlyAgent:
                     'error': f"Tool {tool_call.tool_name} not found",
                 }
 
-            # Validate parameters before execution
-            await tool.validate_parameters(**tool_call.parameters)
+            # Surface plan-time validation failures without touching the tool
+            if tool_call.validation_error:
+                raise ValueError(tool_call.validation_error)
 
-            logger.info(f"Executing tool: {tool_call.tool_name}")
-            result = await tool.execute(**tool_call.parameters)
+            # Validate parameters before execution (no I/O, so no await)
+            tool.validate_parameters_sync(**tool_call.parameters)
+
+            logger.info("Executing tool: %s", tool_call.tool_name)
+            timeout_s = getattr(tool.schema, "timeout_s", 30.0)
+            result = await asyncio.wait_for(
+                tool.execute(**tool_call.parameters),
+                timeout=timeout_s,
+            )
 
-            execution_time_ms = int((time.time() - tool_start) * 1000)
-            logger.info(f"Tool {tool_call.tool_name} completed in {execution_time_ms}ms")
+            execution_time_ms = (time.perf_counter_ns() - tool_start_ns) // 1_000_000
+            logger.info("Tool %s completed in %dms", tool_call.tool_name, execution_time_ms)
 
             return {
                 'action_id': tool_call.action_id,
@@ -374,8 +446,19 @@ class PlanlyAgent:
                 'result': result,
             }
 
+        except asyncio.TimeoutError:
+            logger.error(
+                "Tool %s timed out after %.0fs", tool_call.tool_name, timeout_s
+            )
+            return {
+                'action_id': tool_call.action_id,
+                'tool_name': tool_call.tool_name,
+                'success': False,
+                'error': f"Tool '{tool_call.tool_name}' timed out. Please try again.",
+                'error_code': 'tool_timeout',
+            }
         except ValueError as e:
-            logger.error(f"Tool parameter validation failed ({tool_call.tool_name}): {e}")
+            logger.error("Tool parameter validation failed (%s): %s", tool_call.tool_name, e)
             return {
                 'action_id': tool_call.action_id,
                 'tool_name': tool_call.tool_name,
@@ -383,7 +466,7 @@ class PlanlyAgent:
                 'error': f"Invalid parameters for '{tool_call.tool_name}': {e}",
             }
         except Exception as e:
-            logger.error(f"Tool execution error ({tool_call.tool_name}): {e}", exc_info=True)
+            logger.error("Tool execution error (%s): %s", tool_call.tool_name, e, exc_info=True)
             return {
                 'action_id': tool_call.action_id,
                 'tool_name': tool_call.tool_name,
@@ -9,9 +9,10 @@ the duplicated get_agent() factories that previously existed in each route modul
 import logging
 from typing import Optional
 
-from database.client import get_supabase
+from database.client import get_pool
 from database.repositories.conversation_repo import ConversationRepository
 from database.repositories.event_repo import EventRepository
+from database.repositories.user_repo import UserRepository
 from core.context_manager import ContextManager
 from core.reasoning_engine import ReasoningEngine
 from integrations.ollama.client import OllamaClient
@@ -28,13 +29,18 @@ logger = logging.getLogger(__name__)
 _ollama_client: Optional[OllamaClient] = None
 _tool_registry: Optional[ToolRegistry] = None
 _calendar_client: Optional[GoogleCalendarClient] = None
+_conversation_repo: Optional[ConversationRepository] = None
+_user_repo: Optional[UserRepository] = None
+_event_repo: Optional[EventRepository] = None
+_agent: Optional[PlanlyAgent] = None
 
 
 def init_dependencies() -> None:
     """
     Initialize all shared singletons. Called once at application startup.
     """
-    global _ollama_client, _tool_registry, _calendar_client
+    global _ollama_client, _tool_registry, _calendar_client, _conversation_repo, \
+        _user_repo, _event_repo, _agent
 
     logger.info("Initializing shared dependencies...")
 
@@ -50,6 +56,23 @@ def init_dependencies() -> None:
     _tool_registry.register(RestaurantSearchTool())
     _tool_registry.register(CinemaSearchTool())
 
+    # Agent and its collaborators — stateless across requests, so build
+    # the whole graph once instead of re-allocating it per request
+    pool = get_pool()
+    # Shared repo — its background message-flush queue must be a singleton
+    # so there is exactly one flusher task per process
+    _conversation_repo = ConversationRepository(pool)
+    # Shared repo — its TTL user cache only pays off if every request hits
+    # the same instance
+    _user_repo = UserRepository(pool)
+    _event_repo = EventRepository(pool)
+    _agent = PlanlyAgent(
+        context_manager=ContextManager(_conversation_repo),
+        reasoning_engine=ReasoningEngine(_ollama_client, _tool_registry),
+        tool_registry=_tool_registry,
+        event_repo=_event_repo,
+    )
+
     logger.info(
         f"Dependencies initialized: {len(_tool_registry.list_tools())} tools registered"
     )
@@ -58,6 +81,15 @@ def init_dependencies() -> None:
 async def shutdown_dependencies() -> None:
     """Clean up resources on shutdown."""
     global _ollama_client
+    if _conversation_repo:
+        await _conversation_repo.aclose()
+        logger.info("ConversationRepository flush queue drained")
+    if _user_repo:
+        await _user_repo.aclose()
+        logger.info("UserRepository login buffer flushed")
+    if _event_repo:
+        await _event_repo.aclose()
+        logger.info("EventRepository audit-log queue drained")
     if _ollama_client:
         await _ollama_client.close()
         logger.info("OllamaClient closed")
@@ -75,29 +107,29 @@ def get_tool_registry() -> ToolRegistry:
     return _tool_registry
 
 
+def get_conversation_repo() -> ConversationRepository:
+    """Return the shared ConversationRepository (owns the message flush queue)."""
+    if _conversation_repo is None:
+        raise RuntimeError("Dependencies not initialized. Call init_dependencies() first.")
+    return _conversation_repo
+
+
+def get_user_repo() -> UserRepository:
+    """Return the shared UserRepository (owns the TTL user-lookup cache)."""
+    if _user_repo is None:
+        raise RuntimeError("Dependencies not initialized. Call init_dependencies() first.")
+    return _user_repo
+
+
 def get_agent() -> PlanlyAgent:
     """
-    Build a PlanlyAgent using shared singletons.
-
-    Repositories are lightweight wrappers around the Supabase client,
-    so creating them per-request is fine. The expensive objects
-    (OllamaClient, ToolRegistry, GoogleCalendarClient) are shared.
+    Return the shared PlanlyAgent singleton.
 
-    WARNING: ContextManager, ReasoningEngine, and repositories are created
-    per-request and MUST remain stateless.  Do NOT add mutable instance
-    state (caches, counters, etc.) to these classes — it will not be shared
-    across requests and will silently break under concurrency.
+    The agent and its collaborators (ContextManager, ReasoningEngine,
+    repositories) are shared across ALL requests, so they MUST remain
+    stateless with respect to a single request — per-request state has to
+    live in local variables, never on these instances.
     """
-    supabase = get_supabase()
-    conversation_repo = ConversationRepository(supabase)
-    event_repo = EventRepository(supabase)
-
-    context_manager = ContextManager(conversation_repo)
-    reasoning_engine = ReasoningEngine(get_ollama_client(), get_tool_registry())
-
-    return PlanlyAgent(
-        context_manager=context_manager,
-        reasoning_engine=reasoning_engine,
-        tool_registry=get_tool_registry(),
-        event_repo=event_repo,
-    )
+    if _agent is None:
+        raise RuntimeError("Dependencies not initialized. Call init_dependencies() first.")
+    return _agent
@@ -1,14 +1,20 @@
 """Reasoning Engine — LLM integration for intent extraction and planning."""
+import hashlib
 import json
 import logging
 from typing import Optional, Union
 from datetime import datetime
-import dateparser
+from cachetools import TTLCache
+from dateparser.date import DateDataParser
 
 from models.intent import Intent
 from models.action import ActionPlan, ToolCall
 from models.message import ConversationContext
-from integrations.ollama.client import OllamaClient, _extract_json_object
+from integrations.ollama.client import (
+    OllamaClient,
+    _parse_json_object,
+    _schema_prompt_fragment,
+)
 from integrations.ollama.prompts import (
     INTENT_EXTRACTION_PROMPT,
     TOOL_PLANNING_PROMPT,
@@ -18,6 +24,30 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        """Compact JSON for prompt payloads (orjson: C-speed, bytes out)."""
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        """Compact JSON for prompt payloads (stdlib fallback)."""
+        return json.dumps(obj, default=str, separators=(",", ":"))
+
+
+# Pre-build the schema prompt fragments for the two structured-output models
+# at import time, so not even the first request pays the
+# model_json_schema() walk.
+for _schema in (Intent, ActionPlan):
+    _schema_prompt_fragment(_schema)
+del _schema
+
+# Single-pass XML escaping for text injected into prompt templates.
+# Escaping '&' as well prevents pre-escaped user text ("&lt;") from
+# double-decoding on the way back out.
+_XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
 
 class ReasoningEngine:
     """
@@ -30,6 +60,19 @@ class ReasoningEngine:
     def __init__(self, ollama_client: OllamaClient, tool_registry):
         self.ollama = ollama_client
         self.tool_registry = tool_registry
+        # dateparser.parse() builds a fresh DateDataParser (locale loading
+        # and language scanning) on every call — construct one up front and
+        # reuse it for all requests.
+        self._date_parser = DateDataParser(
+            languages=["en"],
+            settings={"PREFER_DATES_FROM": "future"},
+        )
+        # Raw intent results keyed by conversation text: a replayed
+        # conversation (bot retry, duplicate webhook delivery) skips the
+        # whole LLM round trip. Entries are stored serialized and
+        # revalidated on hit, because the post-processing below mutates the
+        # returned object in place.
+        self._intent_cache: TTLCache = TTLCache(maxsize=2048, ttl=600)
 
     async def extract_intent(self, context: ConversationContext) -> Intent:
         """
@@ -38,47 +81,71 @@ class ReasoningEngine:
         Uses a per-phase timeout from settings so that one slow LLM call
         doesn't block the entire request for minutes.
         """
+        # Nothing to reason about — skip the prompt build and the LLM call
+        # entirely rather than asking the model about an empty conversation.
+        if not context.messages:
+            return self._create_fallback_intent(context)
+
         try:
             conversation_text = self._format_conversation(context)
+            cache_key = hashlib.blake2b(
+                conversation_text.encode(), digest_size=16
+            ).digest()
 
-            prompt = INTENT_EXTRACTION_PROMPT.format(
-                conversation=conversation_text,
-            )
-
-            try:
-                intent_response = await self.ollama.generate_structured(
-                    prompt=prompt,
-                    schema=Intent,
-                    timeout_s=settings.LLM_INTENT_TIMEOUT,
+            cached = self._intent_cache.get(cache_key)
+            if cached is not None:
+                intent_response = Intent.model_validate_json(cached)
+            else:
+                prompt = INTENT_EXTRACTION_PROMPT.format(
+                    conversation=conversation_text,
                 )
-            except (TimeoutError, ConnectionError, OSError) as e:
-                # Infrastructure failure — propagate so the caller can report
-                # a retryable error instead of returning a silent fallback.
-                logger.error(f"LLM infrastructure error during intent extraction: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"LLM intent parsing failed (non-retryable): {e}")
-                return self._create_fallback_intent(context)
-
-            # Filter participants by consent
-            consenting_participants = []
-            for participant in intent_response.participants:
-                for user_id, signal in context.consent_signals.items():
-                    if signal == "accepted":
-                        user = context.participants.get(user_id)
-                        if user and (
-                            user.get("username") == participant
-                            or user.get("first_name") == participant
-                        ):
-                            consenting_participants.append(participant)
-                            break
-
-            intent_response.participants = list(set(consenting_participants))
-
-            # Parse datetime if string
+
+                try:
+                    intent_response = await self.ollama.generate_structured(
+                        prompt=prompt,
+                        schema=Intent,
+                        timeout_s=settings.LLM_INTENT_TIMEOUT,
+                    )
+                except (TimeoutError, ConnectionError, OSError) as e:
+                    # Infrastructure failure — propagate so the caller can report
+                    # a retryable error instead of returning a silent fallback.
+                    logger.error(f"LLM infrastructure error during intent extraction: {e}")
+                    raise
+                except Exception as e:
+                    logger.error(f"LLM intent parsing failed (non-retryable): {e}")
+                    return self._create_fallback_intent(context)
+
+                self._intent_cache[cache_key] = intent_response.model_dump_json()
+
+            # Filter participants by consent — build a name index of
+            # accepted users once, then each LLM-named participant is an
+            # O(1) lookup instead of a scan over all consent signals.
+            accepted_names = set()
+            for user_id, signal in context.consent_signals.items():
+                if signal != "accepted":
+                    continue
+                user = context.participants.get(user_id)
+                if user:
+                    if user.get("username"):
+                        accepted_names.add(user["username"])
+                    if user.get("first_name"):
+                        accepted_names.add(user["first_name"])
+
+            # dict.fromkeys dedupes while preserving the LLM's ordering
+            intent_response.participants = list(dict.fromkeys(
+                p for p in intent_response.participants if p in accepted_names
+            ))
+
+            # Parse datetime if string. The prompt schema asks for ISO-8601,
+            # so try the cheap C parser first and only fall back to
+            # dateparser's natural-language machinery when the LLM strays.
             if isinstance(intent_response.datetime, str):
-                parsed_time = dateparser.parse(intent_response.datetime)
-                intent_response.datetime = parsed_time
+                dt_str = intent_response.datetime
+                try:
+                    intent_response.datetime = datetime.fromisoformat(dt_str)
+                except ValueError:
+                    date_data = self._date_parser.get_date_data(dt_str)
+                    intent_response.datetime = date_data.date_obj if date_data else None
 
             # Check if critical info is missing
             if not intent_response.participants:
@@ -111,7 +178,7 @@ class ReasoningEngine:
 
     def _sanitize_for_prompt(self, text: str) -> str:
         """Escape XML-like tags in data before injecting into prompt templates."""
-        return text.replace("<", "&lt;").replace(">", "&gt;")
+        return text.translate(_XML_ESCAPE)
 
     async def create_action_plan(self, intent: Intent) -> ActionPlan:
         """
@@ -120,11 +187,10 @@ class ReasoningEngine:
         Uses JSON mode and robust extraction to handle messy LLM output.
         """
         try:
-            tool_schemas = self.tool_registry.get_json_schemas()
-            schemas_text = json.dumps(tool_schemas, indent=2)
+            schemas_text = self.tool_registry.get_json_schemas_text()
 
             prompt = TOOL_PLANNING_PROMPT.format(
-                intent=self._sanitize_for_prompt(intent.model_dump_json(indent=2)),
+                intent=self._sanitize_for_prompt(_dumps(intent.model_dump())),
                 tool_schemas=schemas_text,
             )
 
@@ -135,9 +201,8 @@ class ReasoningEngine:
                 json_mode=True,
             )
 
-            # Robust JSON extraction
-            json_str = _extract_json_object(response_text)
-            plan_data = json.loads(json_str)
+            # Robust JSON extraction — single-pass parse, no re-load
+            plan_data = _parse_json_object(response_text)
 
             tool_calls = []
             for tool_data in plan_data.get("tools", []):
@@ -146,6 +211,18 @@ class ReasoningEngine:
                     description=tool_data.get("description", ""),
                     parameters=tool_data.get("parameters", {}),
                 )
+                # Validate eagerly so parameter errors show up in the
+                # proposal instead of failing later at execution time.
+                tool = self.tool_registry.get_tool(tool_call.tool_name)
+                if tool is not None:
+                    try:
+                        tool.validate_parameters_sync(**tool_call.parameters)
+                    except ValueError as e:
+                        logger.warning(
+                            "Planned tool %s has invalid parameters: %s",
+                            tool_call.tool_name, e,
+                        )
+                        tool_call.validation_error = str(e)
                 tool_calls.append(tool_call)
 
             action_plan = ActionPlan(
@@ -174,18 +251,18 @@ class ReasoningEngine:
         """
         try:
             # Normalise intent to JSON string
+            # Compact JSON — pretty-printing costs CPU here and input
+            # tokens on the model side for no quality gain
             if intent is None:
                 intent_json = "{}"
             elif isinstance(intent, dict):
-                intent_json = json.dumps(intent, indent=2, default=str)
+                intent_json = _dumps(intent)
             else:
-                intent_json = intent.model_dump_json(indent=2)
+                intent_json = _dumps(intent.model_dump())
 
             prompt = RESPONSE_COMPOSITION_PROMPT.format(
                 intent=self._sanitize_for_prompt(intent_json),
-                results=self._sanitize_for_prompt(
-                    json.dumps(results, indent=2, default=str)
-                ),
+                results=self._sanitize_for_prompt(_dumps(results)),
             )
 
             response = await self.ollama.generate(
@@ -209,13 +286,13 @@ class ReasoningEngine:
 
     def _format_conversation(self, context: ConversationContext) -> str:
         """Format conversation context for LLM with XML delimiters to reduce prompt injection."""
-        lines = []
-        for msg in context.messages:
-            sender = msg.username or msg.first_name or f"User{msg.user_id}"
-            # Escape any XML-like tags in user text
-            safe_text = msg.text.replace("<", "&lt;").replace(">", "&gt;")
-            lines.append(f'<message sender="{sender}">{safe_text}</message>')
-        return "\n".join(lines)
+        # str.translate escapes in one C-level pass (vs chained .replace),
+        # and the generator feeds join without an intermediate list
+        return "\n".join(
+            f'<message sender="{msg.username or msg.first_name or f"User{msg.user_id}"}">'
+            f'{msg.text.translate(_XML_ESCAPE)}</message>'
+            for msg in context.messages
+        )
 
     def _create_fallback_intent(self, context: ConversationContext) -> Intent:
         """Create basic intent when LLM fails."""
@@ -1,30 +1,141 @@
-"""Supabase database client"""
-from supabase import create_client, Client
-from config.settings import settings
+"""Database client — asyncpg connection pool to the Supabase Postgres instance.
+
+Replaces the synchronous supabase-py REST client: repository methods now run
+native async SQL over pooled connections instead of paying HTTP + PostgREST
+overhead (and a thread-pool hop) per query.
+"""
+import json
 import logging
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import asyncpg
+
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
-_supabase_client: Client = None
+_pool: Optional[asyncpg.Pool] = None
 
+# asyncpg decodes ints/text/uuid/timestamps in C; json(b) columns go through
+# these codecs, so use orjson's C parser when it's installed (intent payloads
+# and tool-call arrays are the bulkiest values we round-trip).
+try:
+    import orjson
 
-def init_supabase() -> Client:
-    """Initialize Supabase client"""
-    global _supabase_client
+    def _json_encode(obj) -> str:
+        return orjson.dumps(obj).decode()
 
-    if _supabase_client is None:
-        logger.info("Initializing Supabase client...")
-        _supabase_client = create_client(
-            settings.SUPABASE_URL,
-            settings.SUPABASE_KEY
+    _json_decode = orjson.loads
+except ImportError:
+    # default=str matches orjson's native handling of datetime/UUID values
+    # (intent payloads carry a parsed datetime) — without it the encoder
+    # raises TypeError and the jsonb write is lost.
+    def _json_encode(obj) -> str:
+        return json.dumps(obj, default=str)
+
+    _json_decode = json.loads
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection setup: encode/decode json(b) as Python objects."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=_json_encode,
+            decoder=_json_decode,
+            schema="pg_catalog",
         )
-        logger.info("✓ Supabase client initialized")
 
-    return _supabase_client
 
+async def init_pool() -> asyncpg.Pool:
+    """Initialize the shared asyncpg connection pool.
+
+    Uses settings.SUPABASE_DB_URL (the pooler/pgbouncer endpoint). Idle
+    connections are recycled after 30 minutes so stale sockets behind NAT
+    don't surface as errors on first use.
+    """
+    global _pool
+
+    if _pool is None:
+        if settings.SUPABASE_PGBOUNCER_URL:
+            # Transaction-mode pgbouncer (port 6543): every query here is a
+            # short single-statement transaction, so many coroutines can
+            # multiplex onto few server backends. Prepared statements don't
+            # survive transaction pooling, so the cache MUST be off.
+            # No server_settings here: pgbouncer rejects startup parameters
+            # outside its tracked set ("unsupported startup parameter: jit")
+            # unless the operator adds them to ignore_startup_parameters,
+            # and JIT never kicks in on these point queries anyway.
+            dsn = settings.SUPABASE_PGBOUNCER_URL
+            pool_kwargs = dict(
+                max_size=20,
+                statement_cache_size=0,
+            )
+            logger.info("Initializing database pool (pgbouncer transaction mode)...")
+        elif settings.SUPABASE_DB_URL:
+            # Direct/session endpoint: fewer multiplexed clients, but
+            # asyncpg can transparently prepare and LRU-cache statements
+            # per connection, keyed by SQL text — repeated hot queries
+            # (user lookups, session checks) skip parse/plan entirely.
+            dsn = settings.SUPABASE_DB_URL
+            pool_kwargs = dict(
+                max_size=10,
+                statement_cache_size=512,
+            )
+            logger.info("Initializing database connection pool...")
+        else:
+            raise RuntimeError(
+                "SUPABASE_DB_URL is not configured — set it to the Postgres "
+                "connection string (or SUPABASE_PGBOUNCER_URL for the "
+                "transaction-mode pooler endpoint) in .env"
+            )
+
+        _pool = await asyncpg.create_pool(
+            dsn,
+            min_size=2,
+            max_inactive_connection_lifetime=1800,
+            timeout=30,
+            init=_init_connection,
+            **pool_kwargs,
+        )
+        logger.info("✓ Database connection pool initialized")
+
+    return _pool
+
+
+def get_pool() -> asyncpg.Pool:
+    """Get the shared connection pool. Raises if init_pool() has not run."""
+    if _pool is None:
+        raise RuntimeError("Database pool not initialized. Call init_pool() first.")
+    return _pool
+
+
+async def close_pool() -> None:
+    """Close the pool and release all connections (application shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+        logger.info("Database connection pool closed")
+
+
+def record_to_dict(record: Optional[asyncpg.Record]) -> Optional[dict]:
+    """Convert an asyncpg Record to the JSON-style dict the repositories return.
 
-def get_supabase() -> Client:
-    """Get Supabase client instance"""
-    if _supabase_client is None:
-        return init_supabase()
-    return _supabase_client
+    The repository contract (inherited from the PostgREST client) is plain
+    dicts with string UUIDs and ISO-8601 timestamps; asyncpg hands back
+    native UUID/datetime objects, so normalise them here.
+    """
+    if record is None:
+        return None
+    out = {}
+    for key, value in record.items():
+        if isinstance(value, UUID):
+            out[key] = str(value)
+        elif isinstance(value, datetime):
+            out[key] = value.isoformat()
+        else:
+            out[key] = value
+    return out
@@ -0,0 +1,87 @@
+-- Migration: convert messages to hourly range partitions
+--
+-- The rolling 1-hour window means most of the table is always garbage.
+-- Row-level DELETEs pay index updates, WAL, and vacuum amplification that
+-- grow with table size; dropping an hourly partition is an O(1) metadata
+-- operation. cleanup_old_messages() detects whether this migration has been
+-- applied and falls back to row DELETEs when it hasn't.
+--
+-- Apply manually (or via the Supabase SQL editor). Requires the pg_cron
+-- extension for automatic partition rotation.
+
+BEGIN;
+
+ALTER TABLE messages RENAME TO messages_old;
+
+-- Renaming a table does not rename its indexes: the old ones keep their
+-- names until messages_old is dropped, so the CREATE INDEX statements
+-- below would abort with "relation already exists". Move them aside.
+ALTER INDEX IF EXISTS idx_messages_conversation_timestamp
+    RENAME TO idx_messages_conversation_timestamp_old;
+ALTER INDEX IF EXISTS idx_messages_bot_mention
+    RENAME TO idx_messages_bot_mention_old;
+
+CREATE TABLE messages (
+    id BIGSERIAL,
+    conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+    message_id BIGINT,
+    user_id BIGINT,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    text TEXT NOT NULL,
+    timestamp TIMESTAMPTZ NOT NULL,
+    source TEXT NOT NULL,
+    is_bot_mention BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp),
+    UNIQUE (conversation_id, message_id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE INDEX idx_messages_conversation_timestamp
+    ON messages(conversation_id, timestamp DESC);
+CREATE INDEX idx_messages_bot_mention
+    ON messages(conversation_id, is_bot_mention)
+    WHERE is_bot_mention = TRUE;
+
+-- Create the partition covering a given hour; named messages_YYYYMMDD_HH.
+CREATE OR REPLACE FUNCTION create_messages_partition(part_hour TIMESTAMPTZ)
+RETURNS void AS $$
+DECLARE
+    part_start TIMESTAMPTZ := date_trunc('hour', part_hour);
+    part_name TEXT := 'messages_' || to_char(part_start AT TIME ZONE 'UTC', 'YYYYMMDD_HH24');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF messages FOR VALUES FROM (%L) TO (%L)',
+        part_name, part_start, part_start + INTERVAL '1 hour'
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bootstrap: previous hour (so the backfill below can keep the full
+-- still-in-window history), current hour, and the next one.
+SELECT create_messages_partition(NOW() - INTERVAL '1 hour');
+SELECT create_messages_partition(NOW());
+SELECT create_messages_partition(NOW() + INTERVAL '1 hour');
+
+-- Keep one hour of headroom; the application drops stale partitions.
+SELECT cron.schedule(
+    'create-next-messages-partition',
+    '5 * * * *',
+    $$SELECT create_messages_partition(NOW() + INTERVAL '1 hour')$$
+);
+
+INSERT INTO messages
+    (conversation_id, message_id, user_id, username, first_name, last_name,
+     text, timestamp, source, is_bot_mention, created_at)
+SELECT conversation_id, message_id, user_id, username, first_name, last_name,
+       text, timestamp, source, is_bot_mention, created_at
+-- Keep the whole rolling window, not just the current hour: truncating
+-- at date_trunc('hour', NOW()) would silently discard up to 59 minutes
+-- of still-in-window messages at cutover.
+FROM messages_old
+WHERE timestamp >= NOW() - INTERVAL '1 hour';
+
+DROP TABLE messages_old;
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- Migration: GIN index for participant-containment lookups on events
+--
+-- get_events_by_user matches "created by OR participating" in one query
+-- using jsonb containment (participants @> ...). jsonb_path_ops keeps the
+-- index small and supports exactly the @> operator we use.
+--
+-- CONCURRENTLY cannot run inside a transaction block; apply standalone.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_participants_gin
+    ON events USING GIN (participants jsonb_path_ops);
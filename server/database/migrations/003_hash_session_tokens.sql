@@ -0,0 +1,14 @@
+-- Store refresh tokens as SHA-256 digests instead of raw strings.
+--
+-- The application now hashes tokens before every insert/lookup/delete
+-- (database/repositories/user_repo.py), so the column holds 64-char hex
+-- digests: leaked session rows contain nothing replayable, and the index
+-- keys are fixed-length. Existing rows are converted in place so live
+-- sessions survive the cutover — deploy this together with the
+-- application change, not before.
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+UPDATE user_sessions
+SET refresh_token = encode(digest(refresh_token, 'sha256'), 'hex')
+WHERE length(refresh_token) <> 64;
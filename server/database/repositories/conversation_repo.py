@@ -1,19 +1,79 @@
 """Conversation repository for database operations."""
-from asyncio import to_thread
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
-from supabase import Client
+import asyncio
+import asyncpg
 import logging
 
+from database.client import record_to_dict
+
 logger = logging.getLogger(__name__)
 
+_MESSAGE_COLUMNS = (
+    "conversation_id", "message_id", "user_id", "username", "first_name",
+    "last_name", "text", "timestamp", "source", "is_bot_mention",
+)
+
+# ON CONFLICT DO NOTHING (targetless, so it covers the unique constraint in
+# both the partitioned and unpartitioned schemas): Telegram redelivers
+# updates, and without it one duplicate row would fail an entire atomic
+# executemany batch instead of just being skipped.
+_INSERT_MESSAGE_SQL = (
+    f"INSERT INTO messages ({', '.join(_MESSAGE_COLUMNS)}) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(_MESSAGE_COLUMNS) + 1))}) "
+    "ON CONFLICT DO NOTHING"
+)
+
+
+def _message_args(conversation_id: UUID, msg: dict) -> tuple:
+    """Map a message dict onto the INSERT parameter tuple."""
+    ts = msg.get("timestamp")
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    return (
+        conversation_id,
+        msg.get("message_id"),
+        msg.get("user_id"),
+        msg.get("username"),
+        msg.get("first_name"),
+        msg.get("last_name"),
+        msg["text"],
+        ts,
+        msg.get("source", "telegram"),
+        msg.get("is_bot_mention", False),
+    )
+
 
 class ConversationRepository:
-    """Handle conversation and message database operations."""
+    """Handle conversation and message database operations.
+
+    Single-row message inserts are coalesced through an in-memory queue and
+    flushed in batches by a background task — messages arrive in bursts per
+    group, and one multi-row INSERT per burst replaces one round-trip per row.
+    """
+
+    # Flush whenever this many rows are queued or the interval elapses,
+    # whichever comes first.
+    _FLUSH_MAX_ROWS = 200
+    _FLUSH_INTERVAL_S = 0.25
+    # Above this depth the queue is considered backed up and writes go
+    # straight to the database to preserve backpressure.
+    _QUEUE_HIGH_WATERMARK = 1000
+    # Batches at or above this size stream via binary COPY instead of a
+    # prepared multi-row INSERT — COPY skips per-row parsing and is
+    # substantially faster for backfill/catch-up sized batches.
+    _BATCH_COPY_THRESHOLD = 100
 
-    def __init__(self, supabase: Client):
-        self.supabase = supabase
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+        # Created lazily on first insert so construction stays cheap and
+        # doesn't require a running event loop.
+        self._queue: Optional[asyncio.Queue[Tuple[UUID, dict]]] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        # Whether the messages table is hour-partitioned — probed on first
+        # cleanup and remembered (None = not yet checked).
+        self._partitioned: Optional[bool] = None
 
     async def get_or_create_conversation(
         self,
@@ -22,123 +82,303 @@ class ConversationRepository:
         telegram_group_title: Optional[str] = None,
         user_id: Optional[UUID] = None,
     ) -> dict:
-        """Get existing conversation or create new one."""
+        """Get existing conversation or create new one.
+
+        A single INSERT ... ON CONFLICT round-trip: the UNIQUE constraint on
+        telegram_group_id resolves the get-vs-create race atomically in the
+        database instead of a SELECT followed by an INSERT (which could
+        create duplicate rows under concurrency). NULL group ids never
+        conflict, so desktop conversations always insert a fresh row —
+        same behaviour as before.
+        """
         try:
-            if telegram_group_id:
-                response = await to_thread(
-                    lambda: self.supabase.table("conversations")
-                    .select("*")
-                    .eq("telegram_group_id", telegram_group_id)
-                    .execute()
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO conversations
+                        (conversation_type, telegram_group_id,
+                         telegram_group_title, user_id)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (telegram_group_id) DO UPDATE SET
+                        telegram_group_title = COALESCE(
+                            EXCLUDED.telegram_group_title,
+                            conversations.telegram_group_title
+                        )
+                    RETURNING *
+                    """,
+                    conversation_type,
+                    telegram_group_id,
+                    telegram_group_title,
+                    user_id,
                 )
-                if response.data:
-                    return response.data[0]
-
-            data = {
-                "conversation_type": conversation_type,
-                "telegram_group_id": telegram_group_id,
-                "telegram_group_title": telegram_group_title,
-                "user_id": str(user_id) if user_id else None,
-            }
-
-            response = await to_thread(
-                lambda: self.supabase.table("conversations").insert(data).execute()
-            )
-            return response.data[0] if response.data else None
+                return record_to_dict(row)
 
         except Exception as e:
             logger.error(f"Error getting/creating conversation: {e}")
             raise
 
     async def insert_message(self, conversation_id: UUID, message_data: dict) -> bool:
-        """Insert a message. Returns True on success, False on failure."""
+        """Enqueue a message for batched insertion.
+
+        Returns True once the message is accepted. The actual INSERT happens
+        on the background flusher within _FLUSH_INTERVAL_S; if the queue is
+        backed up past the high-watermark, falls back to a direct insert so
+        producers feel the backpressure instead of growing the queue unboundedly.
+
+        Bot mentions always insert directly: the webhook processes the
+        mention immediately after storing it, and get_context must see the
+        triggering message — read-your-writes beats batching on that path.
+        """
+        if self._flusher_task is None:
+            self._queue = asyncio.Queue()
+            self._flusher_task = asyncio.create_task(self._flusher())
+
+        if (
+            message_data.get("is_bot_mention")
+            or self._queue.qsize() >= self._QUEUE_HIGH_WATERMARK
+        ):
+            return await self._insert_message_direct(conversation_id, message_data)
+
+        await self._queue.put((conversation_id, message_data))
+        return True
+
+    async def _insert_message_direct(
+        self, conversation_id: UUID, message_data: dict
+    ) -> bool:
+        """Insert a single message immediately. Returns True on success."""
         try:
-            data = {
-                "conversation_id": str(conversation_id),
-                **message_data,
-            }
-            await to_thread(
-                lambda: self.supabase.table("messages").insert(data).execute()
-            )
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    _INSERT_MESSAGE_SQL, *_message_args(conversation_id, message_data)
+                )
             return True
         except Exception as e:
             logger.error(f"Error inserting message: {e}", exc_info=True)
             return False
 
+    async def _flusher(self):
+        """Background task: drain the queue into batched inserts.
+
+        Collects up to _FLUSH_MAX_ROWS rows or waits _FLUSH_INTERVAL_S for
+        more, groups them by conversation, and writes each group with a
+        single multi-row insert.
+        """
+        while True:
+            try:
+                batch = [await self._queue.get()]
+                while len(batch) < self._FLUSH_MAX_ROWS:
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(
+                                self._queue.get(), timeout=self._FLUSH_INTERVAL_S
+                            )
+                        )
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._flush_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Message flusher error: {e}", exc_info=True)
+
+    async def _flush_batch(self, batch: List[Tuple[UUID, dict]]):
+        """Write a drained batch, grouped by conversation."""
+        grouped: dict = {}
+        for conversation_id, message_data in batch:
+            grouped.setdefault(conversation_id, []).append(message_data)
+        for conversation_id, messages in grouped.items():
+            await self.insert_messages_batch(conversation_id, messages)
+
+    async def aclose(self):
+        """Stop the flusher and drain any queued messages (shutdown path)."""
+        if self._flusher_task is None:
+            return
+        self._flusher_task.cancel()
+        try:
+            await self._flusher_task
+        except asyncio.CancelledError:
+            pass
+        self._flusher_task = None
+
+        remainder = []
+        while not self._queue.empty():
+            remainder.append(self._queue.get_nowait())
+        if remainder:
+            await self._flush_batch(remainder)
+
     async def insert_messages_batch(
         self, conversation_id: UUID, messages: List[dict]
     ) -> bool:
-        """Insert multiple messages in a single DB round-trip."""
+        """Insert multiple messages in a single DB round-trip.
+
+        Small batches use a prepared multi-row INSERT; large ones stream
+        through Postgres binary COPY (asyncpg encodes the tuples natively).
+        Records are produced lazily — both executemany and
+        copy_records_to_table consume any iterable — so no intermediate
+        list of N tuples is materialized on the flush path.
+        """
         if not messages:
             return True
         try:
-            rows = [
-                {"conversation_id": str(conversation_id), **msg}
-                for msg in messages
-            ]
-            await to_thread(
-                lambda: self.supabase.table("messages").insert(rows).execute()
-            )
+            records = (_message_args(conversation_id, msg) for msg in messages)
+            async with self.pool.acquire() as conn:
+                if len(messages) >= self._BATCH_COPY_THRESHOLD:
+                    try:
+                        await conn.copy_records_to_table(
+                            "messages",
+                            records=records,
+                            columns=list(_MESSAGE_COLUMNS),
+                        )
+                    except asyncpg.UniqueViolationError:
+                        # COPY cannot skip conflicts; redo the batch through
+                        # the INSERT, which drops just the duplicate rows.
+                        await conn.executemany(
+                            _INSERT_MESSAGE_SQL,
+                            (_message_args(conversation_id, msg) for msg in messages),
+                        )
+                else:
+                    await conn.executemany(_INSERT_MESSAGE_SQL, records)
             return True
         except Exception as e:
             logger.error(f"Error batch-inserting messages: {e}", exc_info=True)
             return False
 
-    async def get_messages_since(
+    async def iter_messages_since(
         self,
         conversation_id: UUID,
         cutoff_time: datetime,
-    ) -> List[dict]:
-        """Get messages since a specific time.
+    ) -> AsyncIterator[dict]:
+        """Stream messages since a specific time, oldest first.
+
+        Uses a server-side cursor prefetching 256 rows at a time, so memory
+        stays constant regardless of how chatty the window is and the first
+        rows arrive before the full result set is materialized.
 
         Raises on database errors so callers can distinguish 'no messages'
         from 'database is down'.
         """
         try:
-            response = await to_thread(
-                lambda: self.supabase.table("messages")
-                .select("*")
-                .eq("conversation_id", str(conversation_id))
-                .gte("timestamp", cutoff_time.isoformat())
-                .order("timestamp")
-                .execute()
-            )
-            return response.data if response.data else []
+            async with self.pool.acquire() as conn:
+                # Cursors only exist inside a transaction
+                async with conn.transaction():
+                    cursor = conn.cursor(
+                        """
+                        SELECT * FROM messages
+                        WHERE conversation_id = $1 AND timestamp >= $2
+                        ORDER BY timestamp
+                        """,
+                        conversation_id,
+                        cutoff_time,
+                        prefetch=256,
+                    )
+                    async for row in cursor:
+                        yield record_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting messages: {e}")
             raise
 
+    async def get_messages_since(
+        self,
+        conversation_id: UUID,
+        cutoff_time: datetime,
+    ) -> List[dict]:
+        """Get messages since a specific time as a list.
+
+        Thin wrapper over iter_messages_since for callers that need the
+        whole window at once.
+        """
+        return [
+            msg async for msg in self.iter_messages_since(conversation_id, cutoff_time)
+        ]
+
     async def cleanup_old_messages(self, conversation_id: Optional[UUID] = None):
-        """Delete messages older than 1 hour."""
+        """Remove messages older than 1 hour.
+
+        When the messages table is range-partitioned by hour (see
+        migrations/001_partition_messages.sql), the global cleanup drops the
+        stale partition — an O(1) metadata operation with no index updates,
+        WAL churn, or vacuum pressure. Per-conversation cleanup (rare path)
+        and unpartitioned deployments use the row-level DELETE.
+        """
         try:
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=1)
+            now = datetime.now(timezone.utc)
+            cutoff_time = now - timedelta(hours=1)
 
-            def _do_delete():
-                query = self.supabase.table("messages").delete().lt(
-                    "timestamp", cutoff_time.isoformat()
-                )
-                if conversation_id:
-                    query = query.eq("conversation_id", str(conversation_id))
-                query.execute()
+            async with self.pool.acquire() as conn:
+                if conversation_id is None and await self._messages_partitioned(conn):
+                    # Enumerate child partitions from the catalog instead of
+                    # computing the single expected name — partitions missed
+                    # during downtime or restarts get dropped on the next
+                    # run instead of leaking forever. A partition whose hour
+                    # ended before the cutoff is entirely outside the window.
+                    rows = await conn.fetch(
+                        """
+                        SELECT c.relname
+                        FROM pg_inherits i
+                        JOIN pg_class c ON c.oid = i.inhrelid
+                        JOIN pg_class p ON p.oid = i.inhparent
+                        WHERE p.relname = 'messages'
+                        """
+                    )
+                    for row in rows:
+                        name = row["relname"]
+                        try:
+                            part_start = datetime.strptime(
+                                name, "messages_%Y%m%d_%H"
+                            ).replace(tzinfo=timezone.utc)
+                        except ValueError:
+                            # Not one of our hourly partitions — leave it
+                            continue
+                        if part_start + timedelta(hours=1) <= cutoff_time:
+                            await conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+                            logger.info(
+                                "Dropped stale message partition %s", name
+                            )
+                    return
 
-            await to_thread(_do_delete)
+                if conversation_id:
+                    await conn.execute(
+                        "DELETE FROM messages "
+                        "WHERE timestamp < $1 AND conversation_id = $2",
+                        cutoff_time,
+                        conversation_id,
+                    )
+                else:
+                    await conn.execute(
+                        "DELETE FROM messages WHERE timestamp < $1",
+                        cutoff_time,
+                    )
             logger.info("Cleaned up old messages")
         except Exception as e:
             logger.error(f"Error cleaning up messages: {e}")
 
+    async def _messages_partitioned(self, conn: asyncpg.Connection) -> bool:
+        """Check (once) whether the partitioning migration has been applied."""
+        if self._partitioned is None:
+            self._partitioned = await conn.fetchval(
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_partitioned_table pt
+                    JOIN pg_class c ON c.oid = pt.partrelid
+                    WHERE c.relname = 'messages'
+                )
+                """
+            )
+        return self._partitioned
+
     async def get_conversation_by_id(self, conversation_id: UUID) -> Optional[dict]:
         """Get conversation by ID.
 
         Returns None if not found. Raises on database errors.
         """
         try:
-            response = await to_thread(
-                lambda: self.supabase.table("conversations")
-                .select("*")
-                .eq("id", str(conversation_id))
-                .execute()
-            )
-            return response.data[0] if response.data else None
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    "SELECT * FROM conversations WHERE id = $1",
+                    conversation_id,
+                )
+            return record_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting conversation: {e}")
             raise
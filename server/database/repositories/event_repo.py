@@ -1,19 +1,42 @@
 """Event repository for database operations."""
-from asyncio import to_thread
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
-from supabase import Client
+import asyncio
+import asyncpg
 import logging
 
+from database.client import record_to_dict
+
 logger = logging.getLogger(__name__)
 
+_INSERT_ACTION_SQL = """
+    INSERT INTO agent_actions
+        (conversation_id, user_id, trigger_source, action_type,
+         intent_data, tool_calls, response_text, success,
+         error_message, execution_time_ms)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+"""
+
 
 class EventRepository:
-    """Handle event database operations."""
+    """Handle event database operations.
+
+    Audit-log writes go through a bounded in-memory queue flushed in batches
+    by a background task, so the user-facing flow never waits on telemetry.
+    """
 
-    def __init__(self, supabase: Client):
-        self.supabase = supabase
+    # Rows drained per flush — one batched INSERT instead of 50 round-trips.
+    _LOG_FLUSH_MAX_ROWS = 50
+    _LOG_QUEUE_MAXSIZE = 1000
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+        # Created lazily on first log so construction stays cheap and
+        # doesn't require a running event loop.
+        self._log_queue: Optional[asyncio.Queue] = None
+        self._log_flusher_task: Optional[asyncio.Task] = None
+        self._log_dropped = 0
 
     async def create_event(
         self,
@@ -29,23 +52,27 @@ class EventRepository:
     ) -> dict:
         """Create a new event."""
         try:
-            data = {
-                "conversation_id": str(conversation_id),
-                "created_by_user_id": str(user_id),
-                "activity_type": activity_type,
-                "activity_name": activity_name,
-                "activity_details": activity_details or {},
-                "participants": participants,
-                "event_time": event_time.isoformat(),
-                "location": location,
-                "calendar_event_id": calendar_event_id,
-                "status": "active",
-            }
-
-            response = await to_thread(
-                lambda: self.supabase.table("events").insert(data).execute()
-            )
-            return response.data[0] if response.data else None
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO events
+                        (conversation_id, created_by_user_id, activity_type,
+                         activity_name, activity_details, participants,
+                         event_time, location, calendar_event_id, status)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, 'active')
+                    RETURNING *
+                    """,
+                    conversation_id,
+                    user_id,
+                    activity_type,
+                    activity_name,
+                    activity_details or {},
+                    participants,
+                    event_time,
+                    location,
+                    calendar_event_id,
+                )
+            return record_to_dict(row)
 
         except Exception as e:
             logger.error(f"Error creating event: {e}")
@@ -57,14 +84,16 @@ class EventRepository:
     ) -> List[dict]:
         """Get all events for a conversation."""
         try:
-            response = await to_thread(
-                lambda: self.supabase.table("events")
-                .select("*")
-                .eq("conversation_id", str(conversation_id))
-                .order("event_time", desc=True)
-                .execute()
-            )
-            return response.data if response.data else []
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT * FROM events
+                    WHERE conversation_id = $1
+                    ORDER BY event_time DESC
+                    """,
+                    conversation_id,
+                )
+            return [record_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting events: {e}")
             return []
@@ -75,20 +104,35 @@ class EventRepository:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
     ) -> List[dict]:
-        """Get events created by or including a user."""
+        """Get events created by or including a user.
+
+        One round-trip covers both halves of the docstring: the creator
+        column plus jsonb containment on participants (GIN-indexed, see
+        migrations/002_events_participants_gin.sql). Containment is probed
+        for both stored shapes — entries as {"user_id": ...} objects and as
+        plain id strings. The static SQL with COALESCE'd bounds keeps one
+        prepared statement regardless of which date filters are set.
+        """
         try:
-            def _query():
-                q = self.supabase.table("events").select("*").eq(
-                    "created_by_user_id", str(user_id)
+            uid = str(user_id)
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT * FROM events
+                    WHERE (created_by_user_id = $1
+                           OR participants @> $2::jsonb
+                           OR participants @> $3::jsonb)
+                      AND event_time >= COALESCE($4, '-infinity'::timestamptz)
+                      AND event_time <= COALESCE($5, 'infinity'::timestamptz)
+                    ORDER BY event_time
+                    """,
+                    user_id,
+                    [{"user_id": uid}],
+                    [uid],
+                    start_date,
+                    end_date,
                 )
-                if start_date:
-                    q = q.gte("event_time", start_date.isoformat())
-                if end_date:
-                    q = q.lte("event_time", end_date.isoformat())
-                return q.order("event_time").execute()
-
-            response = await to_thread(_query)
-            return response.data if response.data else []
+            return [record_to_dict(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Error getting user events: {e}")
@@ -109,29 +153,77 @@ class EventRepository:
     ):
         """Log an agent action.
 
-        Best-effort — failures are logged at ERROR level but do not propagate,
-        because audit logging should not break the user-facing flow.
+        Fire-and-forget: the row is enqueued for the background flusher, so
+        the caller never waits on the INSERT. Best-effort — on a full queue
+        the row is dropped (counted), because audit logging should not break
+        or stall the user-facing flow.
         """
+        if self._log_flusher_task is None:
+            self._log_queue = asyncio.Queue(maxsize=self._LOG_QUEUE_MAXSIZE)
+            self._log_flusher_task = asyncio.create_task(self._log_flusher())
+
+        row = (
+            conversation_id,
+            user_id,
+            trigger_source,
+            action_type,
+            intent_data,
+            tool_calls,
+            response_text,
+            success,
+            error_message,
+            execution_time_ms,
+        )
         try:
-            data = {
-                "conversation_id": str(conversation_id),
-                "user_id": str(user_id) if user_id else None,
-                "trigger_source": trigger_source,
-                "action_type": action_type,
-                "intent_data": intent_data,
-                "tool_calls": tool_calls,
-                "response_text": response_text,
-                "success": success,
-                "error_message": error_message,
-                "execution_time_ms": execution_time_ms,
-            }
-
-            await to_thread(
-                lambda: self.supabase.table("agent_actions").insert(data).execute()
+            self._log_queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self._log_dropped += 1
+            logger.error(
+                "AUDIT LOG FAILURE — queue full, dropped action log for "
+                f"conversation={conversation_id} action_type={action_type} "
+                f"(total dropped: {self._log_dropped})"
             )
+
+    async def _log_flusher(self):
+        """Background task: drain queued audit rows into batched inserts."""
+        while True:
+            try:
+                batch = [await self._log_queue.get()]
+                while len(batch) < self._LOG_FLUSH_MAX_ROWS:
+                    try:
+                        batch.append(self._log_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                await self._flush_log_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Action-log flusher error: {e}", exc_info=True)
+
+    async def _flush_log_batch(self, batch: list):
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.executemany(_INSERT_ACTION_SQL, batch)
         except Exception as e:
             logger.error(
-                f"AUDIT LOG FAILURE — action log was NOT persisted for "
-                f"conversation={conversation_id} action_type={action_type}: {e}",
+                f"AUDIT LOG FAILURE — batch of {len(batch)} action logs was "
+                f"NOT persisted: {e}",
                 exc_info=True,
             )
+
+    async def aclose(self):
+        """Stop the flusher and drain any queued audit rows (shutdown path)."""
+        if self._log_flusher_task is None:
+            return
+        self._log_flusher_task.cancel()
+        try:
+            await self._log_flusher_task
+        except asyncio.CancelledError:
+            pass
+        self._log_flusher_task = None
+
+        remainder = []
+        while not self._log_queue.empty():
+            remainder.append(self._log_queue.get_nowait())
+        if remainder:
+            await self._flush_log_batch(remainder)
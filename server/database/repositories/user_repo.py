@@ -1,19 +1,73 @@
 """User repository for database operations."""
-from asyncio import to_thread
-from typing import Optional
+from contextvars import ContextVar
+from typing import Dict, Optional
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
-from supabase import Client
+import asyncio
+import asyncpg
+import hashlib
 import logging
 
+from cachetools import TTLCache
+
+from database.client import record_to_dict
+
 logger = logging.getLogger(__name__)
 
+# Request-scoped lookup cache. Complements the process-wide TTL cache: within
+# one request a repeated lookup (auth check, permission check, logging) is a
+# guaranteed hit with zero staleness concerns, because the dict dies with the
+# request. None outside a request — background tasks bypass it.
+_request_cache: ContextVar[Optional[dict]] = ContextVar(
+    "user_request_cache", default=None
+)
+
+
+def _token_digest(refresh_token: str) -> str:
+    """Fixed-length digest a session row is keyed by.
+
+    Raw refresh tokens never touch the database: a leak of the sessions
+    table yields nothing replayable, and the 64-char hex key probes the
+    index faster than variable-length token strings.
+    """
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def reset_request_user_cache() -> None:
+    """Give the current request context a fresh user-lookup cache.
+
+    Called from request middleware; each Starlette request runs in its own
+    context, so caches never leak between requests.
+    """
+    _request_cache.set({})
+
 
 class UserRepository:
-    """Handle user database operations."""
+    """Handle user database operations.
+
+    Single-user lookups are fronted by a short TTL cache: every Telegram
+    message handler resolves the sender, but user rows change on the order
+    of minutes to hours, so >90% of those round-trips can be skipped.
+    Within one event loop the check-then-store race is benign (worst case a
+    duplicate fetch), so no per-key locking is needed.
+    """
+
+    _CACHE_MAXSIZE = 10_000
+    _CACHE_TTL_S = 60
+    # last_login writes are debounced and merged into one UPDATE per interval
+    _LOGIN_FLUSH_INTERVAL_S = 60
 
-    def __init__(self, supabase: Client):
-        self.supabase = supabase
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+        # Keys are namespaced tuples — ("id", ...), ("email", ...),
+        # ("tg", ...) — so the three lookup paths never collide.
+        self._cache: TTLCache = TTLCache(
+            maxsize=self._CACHE_MAXSIZE, ttl=self._CACHE_TTL_S
+        )
+        # Pending last_login timestamps keyed by user — latest write wins.
+        # Flusher starts lazily so construction needs no running loop.
+        self._login_buf: Dict[UUID, datetime] = {}
+        self._login_flusher_task: Optional[asyncio.Task] = None
 
     async def create_user(
         self,
@@ -24,66 +78,99 @@ class UserRepository:
     ) -> dict:
         """Create a new user."""
         try:
-            data: dict = {
-                "email": email,
-                "full_name": full_name,
-                "is_active": True,
-            }
-            if password_hash:
-                data["password_hash"] = password_hash
-            if oauth_provider:
-                data["oauth_provider"] = oauth_provider
-
-            response = await to_thread(
-                lambda: self.supabase.table("users").insert(data).execute()
-            )
-            return response.data[0] if response.data else None
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO users
+                        (email, password_hash, full_name, oauth_provider, is_active)
+                    VALUES ($1, $2, $3, $4, TRUE)
+                    RETURNING *
+                    """,
+                    email,
+                    password_hash,
+                    full_name,
+                    oauth_provider,
+                )
+            return record_to_dict(row)
         except Exception as e:
             logger.error(f"Error creating user: {e}")
             raise
 
     async def get_by_email(self, email: str) -> Optional[dict]:
-        """Get user by email."""
+        """Get user by email (TTL-cached)."""
+        key = ("email", email)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
         try:
-            response = await to_thread(
-                lambda: self.supabase.table("users")
-                .select("*")
-                .eq("email", email)
-                .execute()
-            )
-            return response.data[0] if response.data else None
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    "SELECT * FROM users WHERE email = $1", email
+                )
+            return self._cache_user(key, record_to_dict(row))
         except Exception as e:
             logger.error(f"Error getting user by email: {e}")
             return None
 
     async def get_by_id(self, user_id: UUID) -> Optional[dict]:
-        """Get user by ID."""
+        """Get user by ID (TTL-cached)."""
+        key = ("id", str(user_id))
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
         try:
-            response = await to_thread(
-                lambda: self.supabase.table("users")
-                .select("*")
-                .eq("id", str(user_id))
-                .execute()
-            )
-            return response.data[0] if response.data else None
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    "SELECT * FROM users WHERE id = $1", user_id
+                )
+            return self._cache_user(key, record_to_dict(row))
         except Exception as e:
             logger.error(f"Error getting user by ID: {e}")
             return None
 
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[dict]:
-        """Get user by Telegram ID."""
+        """Get user by Telegram ID (TTL-cached)."""
+        key = ("tg", telegram_id)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
         try:
-            response = await to_thread(
-                lambda: self.supabase.table("users")
-                .select("*")
-                .eq("telegram_id", telegram_id)
-                .execute()
-            )
-            return response.data[0] if response.data else None
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    "SELECT * FROM users WHERE telegram_id = $1", telegram_id
+                )
+            return self._cache_user(key, record_to_dict(row))
         except Exception as e:
             logger.error(f"Error getting user by Telegram ID: {e}")
             return None
 
+    def _cache_lookup(self, key: tuple) -> Optional[dict]:
+        """Check the request-scoped cache first, then the TTL cache."""
+        req_cache = _request_cache.get()
+        if req_cache is not None:
+            hit = req_cache.get(key)
+            if hit is not None:
+                return hit
+        return self._cache.get(key)
+
+    def _cache_user(self, key: tuple, user: Optional[dict]) -> Optional[dict]:
+        """Store a lookup result. Misses (None) are not cached, so a user
+        created moments ago is visible immediately."""
+        if user is not None:
+            self._cache[key] = user
+            req_cache = _request_cache.get()
+            if req_cache is not None:
+                req_cache[key] = user
+        return user
+
+    def _invalidate(self, *keys: tuple) -> None:
+        """Drop cache entries after a write to the underlying row."""
+        req_cache = _request_cache.get()
+        for key in keys:
+            self._cache.pop(key, None)
+            if req_cache is not None:
+                req_cache.pop(key, None)
+
     async def link_telegram(
         self,
         user_id: UUID,
@@ -92,33 +179,70 @@ class UserRepository:
     ) -> bool:
         """Link Telegram account to user."""
         try:
-            await to_thread(
-                lambda: self.supabase.table("users")
-                .update(
-                    {
-                        "telegram_id": telegram_id,
-                        "telegram_username": telegram_username,
-                    }
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    UPDATE users
+                    SET telegram_id = $2, telegram_username = $3
+                    WHERE id = $1
+                    """,
+                    user_id,
+                    telegram_id,
+                    telegram_username,
                 )
-                .eq("id", str(user_id))
-                .execute()
-            )
+            self._invalidate(("id", str(user_id)), ("tg", telegram_id))
             return True
         except Exception as e:
             logger.error(f"Error linking Telegram account: {e}")
             return False
 
     async def update_last_login(self, user_id: UUID):
-        """Update user's last login timestamp."""
+        """Record the user's last login timestamp.
+
+        The value is only consumed at minute granularity, so writes are
+        buffered in memory and merged into one batched UPDATE per flush
+        interval instead of dirtying the users row on every request.
+        """
+        if self._login_flusher_task is None:
+            self._login_flusher_task = asyncio.create_task(self._flush_logins_loop())
+        self._login_buf[user_id] = datetime.now(timezone.utc)
+        self._invalidate(("id", str(user_id)))
+
+    async def _flush_logins_loop(self):
+        """Background task: push buffered last_login values once per interval."""
+        while True:
+            await asyncio.sleep(self._LOGIN_FLUSH_INTERVAL_S)
+            await self._flush_logins()
+
+    async def _flush_logins(self):
+        if not self._login_buf:
+            return
+        buf, self._login_buf = self._login_buf, {}
         try:
-            await to_thread(
-                lambda: self.supabase.table("users")
-                .update({"last_login": datetime.now(timezone.utc).isoformat()})
-                .eq("id", str(user_id))
-                .execute()
-            )
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    UPDATE users SET last_login = v.ts
+                    FROM (SELECT unnest($1::uuid[]) AS id,
+                                 unnest($2::timestamptz[]) AS ts) v
+                    WHERE users.id = v.id
+                    """,
+                    list(buf.keys()),
+                    list(buf.values()),
+                )
         except Exception as e:
-            logger.error(f"Error updating last login: {e}")
+            logger.error(f"Error flushing last-login updates: {e}")
+
+    async def aclose(self):
+        """Stop the login flusher and write out pending values (shutdown path)."""
+        if self._login_flusher_task is not None:
+            self._login_flusher_task.cancel()
+            try:
+                await self._login_flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._login_flusher_task = None
+        await self._flush_logins()
 
     async def create_session(
         self,
@@ -131,19 +255,20 @@ class UserRepository:
         try:
             expires_at = datetime.now(timezone.utc) + timedelta(days=expires_days)
 
-            response = await to_thread(
-                lambda: self.supabase.table("user_sessions")
-                .insert(
-                    {
-                        "user_id": str(user_id),
-                        "refresh_token": refresh_token,
-                        "client_type": client_type,
-                        "expires_at": expires_at.isoformat(),
-                    }
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO user_sessions
+                        (user_id, refresh_token, client_type, expires_at)
+                    VALUES ($1, $2, $3, $4)
+                    RETURNING *
+                    """,
+                    user_id,
+                    _token_digest(refresh_token),
+                    client_type,
+                    expires_at,
                 )
-                .execute()
-            )
-            return response.data[0] if response.data else None
+            return record_to_dict(row)
         except Exception as e:
             logger.error(f"Error creating session: {e}")
             raise
@@ -151,13 +276,12 @@ class UserRepository:
     async def get_session_by_token(self, refresh_token: str) -> Optional[dict]:
         """Get session by refresh token."""
         try:
-            response = await to_thread(
-                lambda: self.supabase.table("user_sessions")
-                .select("*")
-                .eq("refresh_token", refresh_token)
-                .execute()
-            )
-            return response.data[0] if response.data else None
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    "SELECT * FROM user_sessions WHERE refresh_token = $1",
+                    _token_digest(refresh_token),
+                )
+            return record_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting session: {e}")
             return None
@@ -165,12 +289,11 @@ class UserRepository:
     async def delete_session(self, refresh_token: str):
         """Delete a session."""
         try:
-            await to_thread(
-                lambda: self.supabase.table("user_sessions")
-                .delete()
-                .eq("refresh_token", refresh_token)
-                .execute()
-            )
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    "DELETE FROM user_sessions WHERE refresh_token = $1",
+                    _token_digest(refresh_token),
+                )
         except Exception as e:
             logger.error(f"Error deleting session: {e}")
 
@@ -186,53 +309,100 @@ class UserRepository:
     ) -> Optional[dict]:
         """Store a new Telegram link code for the given user.
 
-        Any existing unconsumed codes for this user are invalidated first
-        so that only one active code exists at a time.
+        Any existing unconsumed codes for this user are invalidated in the
+        same statement so that only one active code exists at a time — the
+        CTE fuses invalidate+insert into one atomic round-trip without an
+        explicit transaction.
         """
         try:
-            # Invalidate previous codes for this user
-            await to_thread(
-                lambda: self.supabase.table("telegram_link_codes")
-                .update({"consumed": True})
-                .eq("user_id", str(user_id))
-                .eq("consumed", False)
-                .execute()
-            )
-
             expires_at = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
-            response = await to_thread(
-                lambda: self.supabase.table("telegram_link_codes")
-                .insert({
-                    "user_id": str(user_id),
-                    "code": code,
-                    "expires_at": expires_at.isoformat(),
-                })
-                .execute()
-            )
-            return response.data[0] if response.data else None
+
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    WITH invalidated AS (
+                        UPDATE telegram_link_codes
+                        SET consumed = TRUE
+                        WHERE user_id = $1 AND consumed = FALSE
+                    )
+                    INSERT INTO telegram_link_codes (user_id, code, expires_at)
+                    VALUES ($1, $2, $3)
+                    RETURNING *
+                    """,
+                    user_id,
+                    code,
+                    expires_at,
+                )
+            return record_to_dict(row)
         except Exception as e:
             logger.error(f"Error creating link code: {e}")
             raise
 
+    async def consume_and_link(
+        self,
+        code: str,
+        telegram_id: int,
+        telegram_username: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Atomically consume a link code and bind the Telegram identity.
+
+        One CTE round-trip replaces consume + link + re-fetch: the UPDATE on
+        the live code serializes concurrent redeemers via the row lock, the
+        users UPDATE only runs when a code row was actually consumed, and
+        RETURNING hands back the linked user. Returns None if the code is
+        missing, expired, or already consumed.
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    WITH consumed AS (
+                        UPDATE telegram_link_codes
+                        SET consumed = TRUE
+                        WHERE code = $1 AND consumed = FALSE
+                          AND expires_at >= NOW()
+                        RETURNING user_id
+                    )
+                    UPDATE users
+                    SET telegram_id = $2, telegram_username = $3
+                    FROM consumed
+                    WHERE users.id = consumed.user_id
+                    RETURNING users.*
+                    """,
+                    code,
+                    telegram_id,
+                    telegram_username,
+                )
+            user = record_to_dict(row)
+            if user is not None:
+                self._invalidate(("id", user["id"]), ("tg", telegram_id))
+            return user
+        except Exception as e:
+            logger.error(f"Error consuming link code: {e}")
+            return None
+
     async def consume_link_code(self, code: str) -> Optional[dict]:
         """Atomically consume a link code and return the associated user_id.
 
         Uses UPDATE ... WHERE consumed=FALSE which serializes via row-level
-        locking — only the first caller gets the row back.
+        locking — only the first caller gets the row back. The code lookup
+        probes the partial index on live codes (idx_telegram_link_codes_code,
+        WHERE consumed = FALSE), which stays tiny and memory-resident no
+        matter how many consumed codes accumulate.
         Returns None if the code is missing, expired, or already consumed.
         """
         try:
-            resp = await to_thread(
-                lambda: self.supabase.table("telegram_link_codes")
-                .update({"consumed": True})
-                .eq("code", code)
-                .eq("consumed", False)
-                .gte("expires_at", datetime.now(timezone.utc).isoformat())
-                .execute()
-            )
-            if not resp.data:
-                return None
-            return resp.data[0]
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    UPDATE telegram_link_codes
+                    SET consumed = TRUE
+                    WHERE code = $1 AND consumed = FALSE AND expires_at >= NOW()
+                    RETURNING user_id, code, expires_at
+                    """,
+                    code,
+                )
+            return record_to_dict(row)
         except Exception as e:
             logger.error(f"Error consuming link code: {e}")
             return None
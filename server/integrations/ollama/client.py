@@ -1,9 +1,13 @@
 """LLM client — supports both local Ollama and cloud APIs with robust JSON extraction."""
+import asyncio
+import hashlib
 import httpx
 import json
 import re
-from typing import Optional, Type
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Type
+from cachetools import TTLCache
+from pydantic import BaseModel, ValidationError
 from config.settings import settings
 import logging
 
@@ -12,65 +16,142 @@ logger = logging.getLogger(__name__)
 # Pre-compiled regex for stripping markdown fences from LLM output
 _MD_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?\s*```", re.DOTALL)
 
+# orjson parses multi-KB LLM payloads ~5x faster than stdlib json; its
+# JSONDecodeError subclasses json.JSONDecodeError, so existing except
+# clauses keep working. Optional dependency — stdlib fallback otherwise.
+try:
+    import orjson
 
-def _extract_json_object(text: str) -> str:
+    _loads = orjson.loads
+    _dumps_bytes = orjson.dumps
+
+    def _dumps_indented(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _dumps_indented(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+# Shared decoder — raw_decode parses and locates the end of an object in
+# one C-level pass, replacing the old Python char-by-char brace matcher.
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_json_object(text: str):
     """
-    Robustly extract a JSON object from LLM output.
+    Robustly parse the first JSON object from LLM output.
 
     Handles:
     - Markdown code fences (```json ... ```)
     - Leading/trailing prose around the JSON
     - Multiple JSON objects (takes the first complete one)
 
-    Raises ValueError if no valid JSON object is found.
+    Returns the parsed object. Raises ValueError if no valid JSON object
+    is found.
     """
-    # 1. Try extracting from markdown fences first
-    fence_match = _MD_FENCE_RE.search(text)
-    if fence_match:
-        candidate = fence_match.group(1).strip()
+    # 1. Try extracting from markdown fences first — the literal substring
+    # check skips the regex engine entirely for the common fence-free case
+    if "```" in text:
+        fence_match = _MD_FENCE_RE.search(text)
+        if fence_match:
+            candidate = fence_match.group(1).strip()
+            try:
+                return _loads(candidate)
+            except json.JSONDecodeError:
+                pass  # fall through to scanning
+
+    # 2. raw_decode from each '{' — parses and finds the object's end in
+    # a single pass, ignoring trailing LLM chatter after the object.
+    # (stays stdlib: orjson has no raw_decode equivalent that tolerates
+    # trailing text)
+    idx = text.find("{")
+    while idx != -1:
         try:
-            json.loads(candidate)
-            return candidate
+            parsed, _end = _JSON_DECODER.raw_decode(text, idx)
+            return parsed
         except json.JSONDecodeError:
-            pass  # fall through to brace-matching
-
-    # 2. Brace-matching with depth tracking and string awareness
-    depth = 0
-    start = None
-    in_string = False
-    escape_next = False
-    for i, ch in enumerate(text):
-        if escape_next:
-            escape_next = False
-            continue
-        if in_string:
-            if ch == '\\':
-                escape_next = True
-            elif ch == '"':
-                in_string = False
-            continue
-        if ch == '"':
-            in_string = True
-            continue
-        if ch == "{":
-            if depth == 0:
-                start = i
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0 and start is not None:
-                candidate = text[start : i + 1]
-                try:
-                    json.loads(candidate)
-                    return candidate
-                except json.JSONDecodeError:
-                    start = None  # reset and keep scanning
+            idx = text.find("{", idx + 1)
 
     raise ValueError("No valid JSON object found in LLM response")
 
 
+@lru_cache(maxsize=64)
+def _schema_prompt_fragment(schema: Type[BaseModel]) -> str:
+    """Build the JSON-schema instruction block for a Pydantic model.
+
+    model_json_schema() walks the model metadata and the dump produces an
+    identical string per class, but the same 2-3 schemas (Intent, ...) are
+    requested on every turn — memoize per class.
+    """
+    return (
+        "IMPORTANT: Respond with valid JSON matching this schema:\n"
+        f"{_dumps_indented(schema.model_json_schema())}\n\n"
+        "Respond ONLY with the JSON object, no other text."
+    )
+
+
+def _extract_json_object(text: str) -> str:
+    """Like _parse_json_object, but returns the JSON re-serialized as a string."""
+    return json.dumps(_parse_json_object(text))
+
+
+# Process-wide HTTP client shared by every OllamaClient instance. Keep-alive
+# connections skip the TCP+TLS handshake on repeated LLM calls, and HTTP/2
+# multiplexes parallel structured calls over one connection. Created lazily
+# (needs a running loop) and closed via OllamaClient.close() on shutdown.
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_lock = asyncio.Lock()
+
+
+async def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        async with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.AsyncClient(
+                    timeout=60.0,
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=100,
+                        max_keepalive_connections=20,
+                        keepalive_expiry=30.0,
+                    ),
+                )
+    return _http_client
+
+
+# Exact-key response cache. LLM calls dominate request latency, and
+# identical (model, temperature, prompts) tuples recur on bot retries and
+# replayed conversations — serve those without an HTTP call at all.
+_response_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+# Outbound discipline for buffered generation: a bounded semaphore keeps a
+# burst of users from blowing past provider rate limits, and identical
+# requests already in flight piggyback on one HTTP call instead of
+# thundering the endpoint.
+_llm_sem = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+_inflight: dict[bytes, "asyncio.Task[str]"] = {}
+
+
+def _on_inflight_done(key: bytes, task: "asyncio.Task[str]") -> None:
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        # Mark any exception retrieved in case every waiter was cancelled
+        task.exception()
+
+
 class OllamaClient:
-    """Wrapper for LLM API — supports local Ollama and OpenAI-compatible cloud APIs."""
+    """Wrapper for LLM API — supports local Ollama and OpenAI-compatible cloud APIs.
+
+    All instances share one pooled httpx client, so constructing an
+    OllamaClient is cheap — but don't wrap it in a per-call context manager
+    that closes it: close() tears down the shared connection pool and is
+    meant for application shutdown only.
+    """
 
     def __init__(
         self,
@@ -82,12 +163,12 @@ class OllamaClient:
         self.api_key = settings.LLM_API_KEY
         self.use_cloud = settings.USE_CLOUD_LLM
 
-        headers: dict[str, str] = {}
+        self._headers: dict[str, str] = {"content-type": "application/json"}
         if self.use_cloud and self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-
-        # Default timeout — callers can override per-request via the timeout_s param
-        self.client = httpx.AsyncClient(timeout=60.0, headers=headers)
+            self._headers["Authorization"] = f"Bearer {self.api_key}"
+        # System prompts are a handful of static templates — reuse their
+        # message dicts instead of re-allocating one per request.
+        self._system_cache: dict[str, dict] = {}
 
     async def generate(
         self,
@@ -96,15 +177,105 @@ class OllamaClient:
         temperature: float = 0.7,
         timeout_s: Optional[int] = None,
         json_mode: bool = False,
+        use_cache: bool = True,
     ) -> str:
-        """Generate text completion."""
+        """Generate text completion.
+
+        Identical calls within the cache TTL return the cached completion
+        without hitting the LLM; pass use_cache=False for calls that must
+        re-sample. Identical calls already in flight share one HTTP
+        request, and total outbound concurrency is capped by a semaphore.
+        """
+        # json_mode changes the completion for identical prompt text, so it
+        # must be part of the key or a coalesced/cached response from the
+        # other mode could be served.
+        key = hashlib.blake2b(
+            f"{self.model}\x00{temperature}\x00{json_mode}"
+            f"\x00{system_prompt or ''}\x00{prompt}".encode()
+        ).digest()
+        if use_cache:
+            cached = _response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        task = _inflight.get(key)
+        if task is None:
+            # The shared fetch runs in its own task: shield only protects a
+            # waiter from its own cancellation, so if the fetch ran inside
+            # the first caller's task, that caller disconnecting would fail
+            # every piggybacked waiter too.
+            task = asyncio.get_running_loop().create_task(
+                self._generate_shared(
+                    key=key,
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    timeout_s=timeout_s,
+                    json_mode=json_mode,
+                    use_cache=use_cache,
+                )
+            )
+            _inflight[key] = task
+            task.add_done_callback(lambda t, _key=key: _on_inflight_done(_key, t))
+
+        # shield: cancelling this waiter must not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _generate_shared(
+        self,
+        *,
+        key: bytes,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        timeout_s: Optional[int],
+        json_mode: bool,
+        use_cache: bool,
+    ) -> str:
+        """Run one coalesced generation: semaphore, stream, cache store."""
+        async with _llm_sem:
+            chunks = []
+            async for piece in self.generate_stream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                timeout_s=timeout_s,
+                json_mode=json_mode,
+            ):
+                chunks.append(piece)
+        text = "".join(chunks)
+        if use_cache:
+            _response_cache[key] = text
+        return text
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        timeout_s: Optional[int] = None,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream completion chunks as the model emits them.
+
+        Yields text pieces as soon as the backend produces them (JSON-lines
+        for local Ollama, SSE deltas for the OpenAI-compatible API), so
+        consumers see the first tokens immediately instead of waiting for
+        the whole completion; abandoning the iterator cancels generation.
+        generate() is a buffering wrapper over this.
+        """
         effective_timeout = timeout_s or 60
+        client = await _get_http_client()
 
         try:
             if self.use_cloud:
                 messages = []
                 if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
+                    sys_msg = self._system_cache.get(system_prompt)
+                    if sys_msg is None:
+                        sys_msg = {"role": "system", "content": system_prompt}
+                        self._system_cache[system_prompt] = sys_msg
+                    messages.append(sys_msg)
                 messages.append({"role": "user", "content": prompt})
 
                 payload: dict = {
@@ -112,21 +283,34 @@ class OllamaClient:
                     "messages": messages,
                     "temperature": temperature,
                     "max_tokens": 2000,
+                    "stream": True,
                 }
                 if json_mode:
                     payload["response_format"] = {"type": "json_object"}
 
-                response = await self.client.post(
+                # content= with pre-encoded bytes bypasses httpx's stdlib
+                # json encoder (content-type is set in self._headers)
+                async with client.stream(
+                    "POST",
                     f"{self.endpoint}/v1/chat/completions",
-                    json=payload,
+                    content=_dumps_bytes(payload),
+                    headers=self._headers,
                     timeout=effective_timeout,
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data: "):
+                            continue
+                        data = line[6:]
+                        if data == "[DONE]":
+                            break
+                        chunk = _loads(data)
+                        delta = chunk["choices"][0].get("delta", {}).get("content")
+                        if delta:
+                            yield delta
 
             else:
-                # Local Ollama API
+                # Local Ollama API — streams one JSON object per line
                 full_prompt = prompt
                 if system_prompt:
                     full_prompt = f"{system_prompt}\n\n{prompt}"
@@ -134,21 +318,30 @@ class OllamaClient:
                 payload = {
                     "model": self.model,
                     "prompt": full_prompt,
-                    "stream": False,
+                    "stream": True,
                     "options": {"temperature": temperature},
                 }
                 # Ollama native JSON mode
                 if json_mode:
                     payload["format"] = "json"
 
-                response = await self.client.post(
+                async with client.stream(
+                    "POST",
                     f"{self.endpoint}/api/generate",
-                    json=payload,
+                    content=_dumps_bytes(payload),
+                    headers=self._headers,
                     timeout=effective_timeout,
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result.get("response", "")
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = _loads(line)
+                        piece = chunk.get("response", "")
+                        if piece:
+                            yield piece
+                        if chunk.get("done"):
+                            break
 
         except httpx.TimeoutException:
             logger.error(f"LLM request timed out after {effective_timeout}s")
@@ -169,14 +362,9 @@ class OllamaClient:
 
         Uses JSON mode when available and robust extraction as fallback.
         """
+        response_text = ""
         try:
-            schema_description = schema.model_json_schema()
-            enhanced_prompt = f"""{prompt}
-
-IMPORTANT: Respond with valid JSON matching this schema:
-{json.dumps(schema_description, indent=2)}
-
-Respond ONLY with the JSON object, no other text."""
+            enhanced_prompt = f"{prompt}\n\n{_schema_prompt_fragment(schema)}"
 
             response_text = await self.generate(
                 prompt=enhanced_prompt,
@@ -186,20 +374,26 @@ Respond ONLY with the JSON object, no other text."""
                 json_mode=True,
             )
 
-            # Robust extraction
-            json_str = _extract_json_object(response_text)
-            parsed = json.loads(json_str)
-            validated = schema(**parsed)
-            return validated
+            # JSON mode was requested, so in the common case the body is a
+            # bare JSON object — let pydantic-core parse and validate it in
+            # one Rust-side pass, no intermediate dict. Fall back to the
+            # fence/scan extraction for models that ignore the format hint.
+            try:
+                return schema.model_validate_json(response_text)
+            except ValidationError:
+                return schema.model_validate(_parse_json_object(response_text))
 
         except (ValueError, json.JSONDecodeError) as e:
             logger.error(f"Failed to parse structured LLM output: {e}")
-            logger.debug(f"Raw response: {response_text[:500] if 'response_text' in dir() else 'N/A'}")
+            logger.debug(f"Raw response: {response_text[:500]}")
             raise
         except Exception as e:
             logger.error(f"Ollama structured generation error: {e}")
             raise
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close the shared HTTP client (application shutdown)."""
+        global _http_client
+        if _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
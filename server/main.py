@@ -22,11 +22,17 @@ def main():
     ╚════════════════════════════════════════╝
     """)
 
+    # Import string (not the app object) so workers > 1 can fork; uvloop +
+    # httptools replace the pure-Python event loop and HTTP parser with C
+    # implementations (both ship via uvicorn[standard]).
     uvicorn.run(
-        app,
+        "main:app",
         host=settings.HOST,
         port=settings.PORT,
         log_level=settings.LOG_LEVEL.lower(),
+        loop="uvloop",
+        http="httptools",
+        workers=settings.WORKERS,
     )
 
 
@@ -9,15 +9,35 @@ def _new_action_id() -> str:
 
 
 class ToolCall(BaseModel):
-    """Tool call model"""
+    """Tool call model.
+
+    Immutable during execution — results are returned as standalone dicts
+    by the agent, never written back onto the plan. This keeps ActionPlan
+    objects safe to cache and re-execute.
+    """
     action_id: str = Field(default_factory=_new_action_id)
     tool_name: str
     description: str = ""
     parameters: dict[str, Any] = Field(default_factory=dict)
-    result: Optional[dict[str, Any]] = None
-    success: bool = False
-    error: Optional[str] = None
-    execution_time_ms: int = 0
+    # Set at plan-creation time when parameters fail schema validation,
+    # so the proposal UI can disable the action before execution.
+    validation_error: Optional[str] = None
+
+    def to_public_dict(self) -> dict[str, Any]:
+        """Client-facing projection — omits execution state and internals.
+
+        validation_error is part of the projection: the proposal UI needs
+        it to disable broken actions, and the confirm flow rebuilds
+        ToolCalls from these dicts, so dropping it here would lose the
+        plan-time validation result entirely.
+        """
+        return {
+            'action_id': self.action_id,
+            'tool_name': self.tool_name,
+            'description': self.description,
+            'parameters': self.parameters,
+            'validation_error': self.validation_error,
+        }
 
 
 class ActionPlan(BaseModel):
@@ -1,10 +1,15 @@
 """Authentication service."""
+import asyncio
 import bcrypt
+import hashlib
+import os
 import secrets
 import string
+import time
 from datetime import datetime, timezone
 from uuid import UUID
 from typing import Optional, Tuple
+from cachetools import TTLCache
 from database.repositories.user_repo import UserRepository
 from utils.jwt_utils import generate_access_token, generate_refresh_token
 from config.settings import settings
@@ -17,6 +22,28 @@ _LINK_CODE_ALPHABET = string.ascii_uppercase + string.digits
 _LINK_CODE_LENGTH = 6
 _LINK_CODE_EXPIRE_MINUTES = 10
 
+# Recently verified refresh tokens, keyed by token digest (never the raw
+# token). Module-level because AuthService is constructed per request —
+# an instance cache would never see a second call. Token refresh is the
+# hottest auth path; a short TTL skips the session round-trip while
+# bounding how long a revoked session can still mint access tokens.
+_refresh_cache: TTLCache = TTLCache(maxsize=10_000, ttl=10)
+
+# bcrypt is deliberately CPU-bound; running more concurrent hashes than
+# cores just thrashes cache and fattens tail latency. Module-level so the
+# cap holds across the per-request AuthService instances — excess logins
+# queue here (cheap) instead of in the thread pool.
+_bcrypt_sem = asyncio.Semaphore(os.cpu_count() or 1)
+
+
+def _hash_password(password: str) -> str:
+    """Bcrypt-hash a password. Runs in the thread pool — a single hash
+    costs hundreds of milliseconds by design (tunable via BCRYPT_COST)."""
+    return bcrypt.hashpw(
+        password.encode("utf-8"),
+        bcrypt.gensalt(rounds=settings.BCRYPT_COST),
+    ).decode("utf-8")
+
 
 class AuthService:
     """Handle authentication operations."""
@@ -43,13 +70,13 @@ class AuthService:
         if existing_user:
             raise ValueError("User with this email already exists")
 
-        # Hash password (None for OAuth users — they authenticate via provider)
+        # Hash password (None for OAuth users — they authenticate via
+        # provider). bcrypt releases the GIL, so to_thread keeps the
+        # event loop serving other requests during the ~250ms hash.
         password_hash: Optional[str] = None
         if password:
-            password_hash = bcrypt.hashpw(
-                password.encode("utf-8"),
-                bcrypt.gensalt(),
-            ).decode("utf-8")
+            async with _bcrypt_sem:
+                password_hash = await asyncio.to_thread(_hash_password, password)
 
         # Create user
         user = await self.user_repo.create_user(
@@ -87,14 +114,20 @@ class AuthService:
         if not password_hash:
             raise ValueError("This account uses OAuth login. Please sign in with Google.")
 
-        if not bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8")):
+        # checkpw is as expensive as hashing — run it off the event loop too
+        async with _bcrypt_sem:
+            password_ok = await asyncio.to_thread(
+                bcrypt.checkpw,
+                password.encode("utf-8"),
+                password_hash.encode("utf-8"),
+            )
+        if not password_ok:
             raise ValueError("Invalid email or password")
 
-        # Generate tokens
-        access_token, refresh_token = await self.generate_tokens(UUID(user["id"]))
-
-        # Update last login
-        await self.user_repo.update_last_login(UUID(user["id"]))
+        # Generate tokens and record the login — parse the id once
+        user_id = UUID(user["id"])
+        access_token, refresh_token = await self.generate_tokens(user_id)
+        await self.user_repo.update_last_login(user_id)
 
         logger.info(f"User logged in: {email}")
         return user, access_token, refresh_token
@@ -119,16 +152,30 @@ class AuthService:
 
         Returns: new access_token
         """
+        cache_key = hashlib.blake2b(
+            refresh_token.encode(), digest_size=16
+        ).digest()
+        cached = _refresh_cache.get(cache_key)
+        if cached is not None:
+            user_id, expires_epoch = cached
+            if time.time() > expires_epoch:
+                raise ValueError("Refresh token expired")
+            return generate_access_token(user_id)
+
         session = await self.user_repo.get_session_by_token(refresh_token)
         if not session:
             raise ValueError("Invalid refresh token")
 
-        # Check expiration (timezone-aware comparison)
-        expires_at = datetime.fromisoformat(session["expires_at"].replace("Z", "+00:00"))
+        # Check expiration. record_to_dict emits +00:00 offsets (never a
+        # bare Z), so the string feeds fromisoformat's C parser directly;
+        # this runs at most once per token per cache TTL.
+        expires_at = datetime.fromisoformat(session["expires_at"])
         if datetime.now(timezone.utc) > expires_at:
             raise ValueError("Refresh token expired")
 
-        return generate_access_token(UUID(session["user_id"]))
+        user_id = UUID(session["user_id"])
+        _refresh_cache[cache_key] = (user_id, expires_at.timestamp())
+        return generate_access_token(user_id)
 
     async def link_telegram_account(
         self,
@@ -154,10 +201,14 @@ class AuthService:
         web) and then types ``/link <code>`` in Telegram to complete the
         binding.
         """
-        code = "".join(
-            secrets.choice(_LINK_CODE_ALPHABET)
-            for _ in range(_LINK_CODE_LENGTH)
-        )
+        # One randbelow draw instead of a urandom syscall per character;
+        # base-36 decomposition keeps the distribution exactly uniform.
+        n = secrets.randbelow(len(_LINK_CODE_ALPHABET) ** _LINK_CODE_LENGTH)
+        chars = []
+        for _ in range(_LINK_CODE_LENGTH):
+            n, idx = divmod(n, len(_LINK_CODE_ALPHABET))
+            chars.append(_LINK_CODE_ALPHABET[idx])
+        code = "".join(chars)
         await self.user_repo.create_link_code(
             user_id=user_id,
             code=code,
@@ -177,24 +228,19 @@ class AuthService:
         Returns the linked user dict.
         Raises ValueError if the code is invalid, expired, or already used.
         """
-        row = await self.user_repo.consume_link_code(code.upper().strip())
-        if not row:
+        # Consume + link + fetch collapse into one atomic round-trip
+        user = await self.user_repo.consume_and_link(
+            code=code.upper().strip(),
+            telegram_id=telegram_id,
+            telegram_username=telegram_username,
+        )
+        if not user:
             raise ValueError(
                 "Invalid or expired link code. "
                 "Please generate a new code from the Planly app."
             )
 
-        user_id = UUID(row["user_id"])
-        success = await self.user_repo.link_telegram(
-            user_id=user_id,
-            telegram_id=telegram_id,
-            telegram_username=telegram_username,
-        )
-        if not success:
-            raise ValueError("Failed to link Telegram account. Please try again.")
-
-        user = await self.user_repo.get_by_id(user_id)
         logger.info(
-            f"Telegram {telegram_id} linked to user {user_id} via code redemption"
+            f"Telegram {telegram_id} linked to user {user['id']} via code redemption"
         )
         return user
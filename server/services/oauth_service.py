@@ -1,5 +1,8 @@
 """OAuth service for Google authentication"""
+import asyncio
 import httpx
+import json
+import jwt
 from urllib.parse import urlencode
 from typing import Dict, Optional
 from config.settings import settings
@@ -7,6 +10,47 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Google's token and userinfo responses are small but sit on the login
+# hot path; orjson skips stdlib json's ensure_ascii round-trip. Optional
+# dependency — stdlib fallback otherwise (same pattern as the LLM client).
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Shared HTTP client for all Google OAuth calls. Service instances are
+# created per request, so the connection pool lives at module level —
+# the token and userinfo requests of one login reuse a single TLS session
+# instead of handshaking twice.
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_lock = asyncio.Lock()
+
+
+async def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        async with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.AsyncClient(
+                    timeout=30.0,
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=100,
+                        max_keepalive_connections=20,
+                    ),
+                )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared OAuth HTTP client (application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class GoogleOAuthService:
     """Handle Google OAuth2 authentication"""
@@ -18,6 +62,15 @@ class GoogleOAuthService:
     def __init__(self):
         self.client_id = settings.GOOGLE_CLIENT_ID
         self.client_secret = settings.GOOGLE_CLIENT_SECRET
+        # Credentials are immutable for the life of the instance
+        self._configured = bool(self.client_id and self.client_secret)
+        # Everything but redirect_uri/state is constant — encode it once
+        self._auth_qs_static = urlencode({
+            "client_id": self.client_id or "",
+            "response_type": "code",
+            "scope": "openid email profile",
+            "access_type": "offline",
+        })
 
     def get_authorization_url(self, redirect_uri: str, state: Optional[str] = None) -> str:
         """
@@ -30,18 +83,11 @@ class GoogleOAuthService:
         Returns:
             Full authorization URL for user to visit
         """
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": redirect_uri,
-            "response_type": "code",
-            "scope": "openid email profile",
-            "access_type": "offline",
-        }
-
+        qs = f"{self._auth_qs_static}&{urlencode({'redirect_uri': redirect_uri})}"
         if state:
-            params["state"] = state
+            qs += f"&{urlencode({'state': state})}"
 
-        return f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
+        return f"https://accounts.google.com/o/oauth2/v2/auth?{qs}"
 
     async def exchange_code_for_tokens(
         self,
@@ -61,7 +107,7 @@ class GoogleOAuthService:
         Raises:
             Exception if exchange fails
         """
-        if not self.client_id or not self.client_secret:
+        if not self._configured:
             raise ValueError("Google OAuth credentials not configured. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env")
 
         token_data = {
@@ -73,13 +119,13 @@ class GoogleOAuthService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(self.GOOGLE_TOKEN_URL, data=token_data)
-                response.raise_for_status()
-                tokens = response.json()
+            client = await _get_http_client()
+            response = await client.post(self.GOOGLE_TOKEN_URL, data=token_data)
+            response.raise_for_status()
+            tokens = _loads(response.content)
 
-                logger.info("Successfully exchanged Google OAuth code for tokens")
-                return tokens
+            logger.info("Successfully exchanged Google OAuth code for tokens")
+            return tokens
 
         except httpx.HTTPStatusError as e:
             logger.error(f"Google token exchange failed: {e.response.text}")
@@ -102,14 +148,14 @@ class GoogleOAuthService:
             Exception if request fails
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {"Authorization": f"Bearer {access_token}"}
-                response = await client.get(self.GOOGLE_USERINFO_URL, headers=headers)
-                response.raise_for_status()
-                user_info = response.json()
+            client = await _get_http_client()
+            headers = {"Authorization": f"Bearer {access_token}"}
+            response = await client.get(self.GOOGLE_USERINFO_URL, headers=headers)
+            response.raise_for_status()
+            user_info = _loads(response.content)
 
-                logger.info(f"Retrieved Google user info for: {user_info.get('email')}")
-                return user_info
+            logger.info(f"Retrieved Google user info for: {user_info.get('email')}")
+            return user_info
 
         except httpx.HTTPStatusError as e:
             logger.error(f"Google userinfo request failed: {e.response.text}")
@@ -129,15 +175,15 @@ class GoogleOAuthService:
             True if successful, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.GOOGLE_REVOKE_URL,
-                    data={"token": token}
-                )
-                response.raise_for_status()
+            client = await _get_http_client()
+            response = await client.post(
+                self.GOOGLE_REVOKE_URL,
+                data={"token": token}
+            )
+            response.raise_for_status()
 
-                logger.info("Successfully revoked Google token")
-                return True
+            logger.info("Successfully revoked Google token")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to revoke Google token: {e}")
@@ -164,8 +210,24 @@ class GoogleOAuthService:
         # Exchange code for tokens
         tokens = await self.exchange_code_for_tokens(code, redirect_uri)
 
-        # Get user info
-        user_info = await self.get_user_info(tokens['access_token'])
+        # The token response already carries an id_token JWT with the same
+        # profile claims userinfo returns (email, name, picture, sub). It
+        # came straight from Google's token endpoint over TLS, so decoding
+        # it locally without signature verification is sound and saves the
+        # second network round trip. The userinfo endpoint stays as a
+        # fallback when the id_token is missing or unreadable.
+        user_info = None
+        id_token = tokens.get('id_token')
+        if id_token:
+            try:
+                user_info = jwt.decode(
+                    id_token, options={"verify_signature": False}
+                )
+            except jwt.InvalidTokenError as e:
+                logger.warning(f"Could not decode id_token, falling back: {e}")
+
+        if not user_info or not user_info.get('email'):
+            user_info = await self.get_user_info(tokens['access_token'])
 
         return {
             "user_info": user_info,
@@ -174,4 +236,4 @@ class GoogleOAuthService:
 
     def is_configured(self) -> bool:
         """Check if Google OAuth is properly configured"""
-        return bool(self.client_id and self.client_secret)
+        return self._configured
@@ -11,3 +11,6 @@ os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
 os.environ.setdefault("SUPABASE_KEY", "test-key-for-unit-tests")
 os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-for-unit-tests")
 os.environ.setdefault("TELEGRAM_WEBHOOK_SECRET", "test-webhook-secret-for-unit-tests")
+# Minimum bcrypt cost — hashing at the production work factor would add
+# hundreds of milliseconds to every test that registers a user
+os.environ.setdefault("BCRYPT_COST", "4")
@@ -23,6 +23,7 @@ def user_repo():
     repo.link_telegram = AsyncMock(return_value=True)
     repo.create_link_code = AsyncMock(return_value={"id": str(uuid4()), "code": "ABC123"})
     repo.consume_link_code = AsyncMock(return_value=None)
+    repo.consume_and_link = AsyncMock(return_value=None)
     repo.get_by_id = AsyncMock(return_value=None)
     return repo
 
@@ -205,22 +206,21 @@ class TestRedeemTelegramLinkCode:
     @pytest.mark.asyncio
     async def test_invalid_code_raises(self, auth_service, user_repo):
         """Unknown / expired / consumed code raises ValueError."""
-        user_repo.consume_link_code.return_value = None
+        user_repo.consume_and_link.return_value = None
         with pytest.raises(ValueError, match="Invalid or expired"):
             await auth_service.redeem_telegram_link_code("BADCOD", 99999)
 
     @pytest.mark.asyncio
     async def test_successful_redemption(self, auth_service, user_repo):
         uid = str(uuid4())
-        user_repo.consume_link_code.return_value = {"user_id": uid, "code": "ABC123"}
-        user_repo.get_by_id.return_value = {"id": uid, "email": "a@b.com"}
+        user_repo.consume_and_link.return_value = {"id": uid, "email": "a@b.com"}
 
         user = await auth_service.redeem_telegram_link_code(
             "ABC123", 99999, "tg_user"
         )
         assert user["id"] == uid
-        user_repo.link_telegram.assert_awaited_once_with(
-            user_id=UUID(uid),
+        user_repo.consume_and_link.assert_awaited_once_with(
+            code="ABC123",
             telegram_id=99999,
             telegram_username="tg_user",
         )
@@ -228,18 +228,17 @@ class TestRedeemTelegramLinkCode:
     @pytest.mark.asyncio
     async def test_code_is_uppercased(self, auth_service, user_repo):
         """Code should be normalised to uppercase before lookup."""
-        user_repo.consume_link_code.return_value = None
+        user_repo.consume_and_link.return_value = None
         with pytest.raises(ValueError):
             await auth_service.redeem_telegram_link_code("abc123", 99999)
         # verify the code was uppercased before calling repo
-        user_repo.consume_link_code.assert_awaited_once_with("ABC123")
+        assert user_repo.consume_and_link.call_args.kwargs["code"] == "ABC123"
 
     @pytest.mark.asyncio
     async def test_link_failure_raises(self, auth_service, user_repo):
-        """If the DB update fails, a clear error is raised."""
-        uid = str(uuid4())
-        user_repo.consume_link_code.return_value = {"user_id": uid, "code": "ABC123"}
-        user_repo.link_telegram.return_value = False
+        """The consume+link statement is atomic — any failure reads as an
+        invalid code rather than a half-linked account."""
+        user_repo.consume_and_link.return_value = None
 
-        with pytest.raises(ValueError, match="Failed to link"):
+        with pytest.raises(ValueError, match="Invalid or expired"):
             await auth_service.redeem_telegram_link_code("ABC123", 99999)
@@ -0,0 +1,73 @@
+"""Tests for time-reference extraction in ContextManager.
+
+Covers deduplication and sentence-level extraction semantics.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from core.context_manager import ContextManager
+from models.message import Message
+from datetime import datetime, timezone
+
+
+def _msg(text: str, user_id: int = 1) -> Message:
+    return Message(
+        message_id=100,
+        user_id=user_id,
+        username="testuser",
+        first_name="Test",
+        last_name="User",
+        text=text,
+        timestamp=datetime.now(timezone.utc),
+        source="telegram",
+        is_bot_mention=False,
+    )
+
+
+@pytest.fixture
+def ctx() -> ContextManager:
+    repo = MagicMock()
+    return ContextManager(repo)
+
+
+class TestExtractTimeReferences:
+    def test_simple_reference(self, ctx):
+        refs = ctx._extract_time_references([_msg("let's meet tomorrow")])
+        assert refs == ["let's meet tomorrow"]
+
+    def test_duplicates_collapsed(self, ctx):
+        msgs = [_msg("dinner on friday?"), _msg("dinner on friday?")]
+        refs = ctx._extract_time_references(msgs)
+        assert refs == ["dinner on friday?"]
+
+    def test_order_preserved(self, ctx):
+        msgs = [_msg("tomorrow works."), _msg("or friday instead?")]
+        refs = ctx._extract_time_references(msgs)
+        assert refs == ["tomorrow works.", "or friday instead?"]
+
+    def test_no_references(self, ctx):
+        refs = ctx._extract_time_references([_msg("sounds great")])
+        assert refs == []
+
+    def test_empty_messages(self, ctx):
+        assert ctx._extract_time_references([]) == []
+
+
+class TestSentenceAnchoring:
+    def test_keyword_not_matched_inside_word(self, ctx):
+        """'am' must not match inside 'ham' (word-boundary anchoring)."""
+        refs = ctx._extract_time_references([_msg("I love ham sandwiches")])
+        assert refs == []
+
+    def test_message_split_once_per_message(self, ctx):
+        """A sentence with several keywords appears exactly once."""
+        refs = ctx._extract_time_references(
+            [_msg("tomorrow evening at 7 pm then.")]
+        )
+        assert refs == ["tomorrow evening at 7 pm then."]
+
+    def test_multiple_sentences_extracted_separately(self, ctx):
+        refs = ctx._extract_time_references(
+            [_msg("Pizza sounds nice. How about friday? I know a place.")]
+        )
+        assert refs == ["How about friday?"]
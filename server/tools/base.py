@@ -1,4 +1,5 @@
 """Base tool interface and registry with JSON Schema support."""
+import json
 from abc import ABC, abstractmethod
 from functools import cached_property
 from typing import Dict, Any, List, Optional
@@ -34,6 +35,9 @@ class ToolSchema(BaseModel):
     description: str
     parameters: List[ToolParameter]
     metadata: ToolMetadata = ToolMetadata()
+    # Hard cap on execute() wall time — a hung external API must not
+    # stall the whole plan.
+    timeout_s: float = 30.0
 
     def to_json_schema(self) -> dict:
         """
@@ -103,8 +107,12 @@ class BaseTool(ABC):
         """
         ...
 
-    async def validate_parameters(self, **kwargs) -> bool:
-        """Validate parameters before execution."""
+    def validate_parameters_sync(self, **kwargs) -> bool:
+        """Validate parameters without awaiting — validation does no I/O.
+
+        Can run at plan-creation time so invalid tool calls are surfaced
+        in the proposal UI instead of failing at execution.
+        """
         required_params = [p.name for p in self.schema.parameters if p.required]
 
         missing = [p for p in required_params if p not in kwargs]
@@ -113,18 +121,24 @@ class BaseTool(ABC):
 
         return True
 
+    async def validate_parameters(self, **kwargs) -> bool:
+        """Validate parameters before execution (async shim for tool.execute)."""
+        return self.validate_parameters_sync(**kwargs)
+
 
 class ToolRegistry:
     """Central registry of available tools."""
 
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
+        self._json_schemas_text: Optional[str] = None
         logger.info("Tool registry initialized")
 
     def register(self, tool: BaseTool) -> None:
         """Register a tool."""
         name = tool.schema.name
         self._tools[name] = tool
+        self._json_schemas_text = None  # invalidate serialized-schema cache
         logger.info(f"Registered tool: {name}")
 
     def get_tool(self, name: str) -> Optional[BaseTool]:
@@ -139,6 +153,16 @@ class ToolRegistry:
         """Get all tool schemas in standard JSON Schema format."""
         return [tool.schema.to_json_schema() for tool in self._tools.values()]
 
+    def get_json_schemas_text(self) -> str:
+        """Get all tool schemas serialized as a JSON string for prompts.
+
+        Registered tools are fixed after startup, so the serialization is
+        cached and only invalidated by register().
+        """
+        if self._json_schemas_text is None:
+            self._json_schemas_text = json.dumps(self.get_json_schemas(), indent=2)
+        return self._json_schemas_text
+
     def list_tools(self) -> List[str]:
         """List all registered tool names."""
         return list(self._tools.keys())
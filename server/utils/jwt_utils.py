@@ -3,15 +3,30 @@ import jwt
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 from typing import Optional
+from cachetools import TTLCache
 from config.settings import settings
 import secrets
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Issued access tokens by user, reused until shortly before they expire —
+# repeated token mints (login + refresh traffic) skip the sign step. The
+# 30s margin means a reused token always has at least that long to live;
+# clients recover via their refresh token as usual. Access tokens carry no
+# per-session claims, so reuse across sessions of the same user is sound.
+_access_token_cache: TTLCache = TTLCache(
+    maxsize=50_000,
+    ttl=max(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 - 30, 1),
+)
+
 
 def generate_access_token(user_id: UUID) -> str:
-    """Generate JWT access token."""
+    """Generate JWT access token (reused per user until near expiry)."""
+    cached = _access_token_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     now = datetime.now(timezone.utc)
     payload = {
         "user_id": str(user_id),
@@ -20,11 +35,13 @@ def generate_access_token(user_id: UUID) -> str:
         "type": "access",
     }
 
-    return jwt.encode(
+    token = jwt.encode(
         payload,
         settings.JWT_SECRET_KEY,
         algorithm=settings.JWT_ALGORITHM,
     )
+    _access_token_cache[user_id] = token
+    return token
 
 
 def generate_refresh_token() -> str: